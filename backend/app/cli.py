@@ -0,0 +1,347 @@
+"""
+Process a directory of Telegram exports without the server:
+
+    python -m app.cli exports/ --out results/ --format csv excel
+    python -m app.cli exports/ --out results/ --format ndjson --merge
+
+Every directory holding messages*.html pages, and every .zip archive, is
+one chat. Pages of all chats are processed in parallel across CPU cores
+and each chat's outputs are written as soon as it is done. Finished chats
+are recorded in the output directory, so an interrupted run picks up
+where it stopped when started again with the same arguments. Their files
+in formats they lack, e.g. one added on the next run, are written from
+the recorded job posts without processing them again.
+"""
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import config
+from .controllers.job_controller import IngestStats, deduplicate_job_posts, process_html_file
+from .models.job_post import JOB_POST_FIELDS
+from .models.job_table import JobTable
+from .services.archive import ArchiveError, collect_pages, page_sort_key
+from .services.dataset_store import DatasetStore
+from .services.excel_exporter import ExcelExporter
+from .services.exporter import iter_csv, iter_ndjson, write_parquet
+from .services.tasks import COMPLETED, FAILED, RUNNING
+
+# Output format -> file extension
+FORMATS = {'csv': 'csv', 'ndjson': 'ndjson', 'parquet': 'parquet', 'excel': 'xlsx'}
+
+# Records finished chats and their job posts, inside the output directory
+STATE_FILE = '.tgjobs-state.sqlite3'
+
+# Base name of merged outputs
+MERGED_NAME = 'all_chats'
+
+# Pages queued per worker process; bounds extracted archives and results held at once
+PAGES_PER_WORKER = 2
+
+_UNSAFE_RE = re.compile(r'[^\w.-]+')
+
+@dataclass
+class Chat:
+    """One chat export: its pages (or archive) and the dataset it produces."""
+    name: str
+    files: List[Path]
+    dataset_id: str = ''
+
+@dataclass
+class ChatRun:
+    """A chat being processed: page results arrive in any order."""
+    chat: Chat
+    workdir: str
+    tables: List[Optional[JobTable]] = field(default_factory=list)
+    stats: IngestStats = field(default_factory=IngestStats)
+    remaining: int = 0
+    error: Optional[str] = None
+    started: float = field(default_factory=time.perf_counter)
+
+@dataclass
+class RunSummary:
+    chats: int = 0
+    resumed: int = 0
+    failed: int = 0
+    pages: int = 0
+    messages: int = 0
+    filtered: int = 0
+    job_posts: int = 0
+    bytes: int = 0
+
+def _is_page(name: str) -> bool:
+    lowered = name.lower()
+    return lowered.startswith('messages') and lowered.endswith('.html')
+
+def find_chats(root: Path) -> List[Chat]:
+    """Chats under `root`: each directory with messages*.html pages, and each .zip archive."""
+    if root.is_file():
+        return [Chat(root.stem, [root])]
+    chats = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        relative = os.path.relpath(directory, root)
+        pages = sorted((name for name in filenames if _is_page(name)), key=page_sort_key)
+        if pages:
+            chats.append(Chat(root.name if relative == '.' else relative,
+                              [Path(directory, name) for name in pages]))
+        for name in sorted(filenames):
+            if name.lower().endswith('.zip'):
+                chats.append(Chat(os.path.normpath(os.path.join(relative, name[:-4])), [Path(directory, name)]))
+    return chats
+
+def _fingerprint(chat: Chat, options: str) -> str:
+    """Dataset ID of a chat: changes when its files or the processing options change."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{chat.name}\0{options}'.encode())
+    for path in chat.files:
+        stat = path.stat()
+        digest.update(f'\0{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}'.encode())
+    return digest.hexdigest()
+
+def output_name(chat_name: str) -> str:
+    """A chat's name made safe as a file name."""
+    return _UNSAFE_RE.sub('_', chat_name.replace(os.sep, '__')).strip('_') or 'chat'
+
+def _process_page(path: Path, filter_noise: bool) -> Tuple[JobTable, IngestStats]:
+    """Pool entry point: one export page's job posts and ingest stats."""
+    stats = IngestStats()
+    return process_html_file(path, stats=stats, filter_noise=filter_noise), stats
+
+def write_output(job_posts: Callable[[], Iterable[Dict[str, Any]]], fmt: str, path: str,
+                 fieldnames: List[str]) -> None:
+    """Write job posts in one format, replacing `path` only once the file is complete."""
+    partial = f'{path}.part'
+    try:
+        if fmt == 'csv':
+            with open(partial, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(iter_csv(job_posts(), fieldnames))
+        elif fmt == 'ndjson':
+            with open(partial, 'wb') as f:
+                f.writelines(iter_ndjson(job_posts()))
+        elif fmt == 'parquet':
+            write_parquet(job_posts(), partial, fieldnames)
+        else:
+            ExcelExporter().create_excel_file(job_posts(), partial)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+class BatchRunner:
+    """Processes chats across a process pool, recording each finished chat in a DatasetStore."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.out = Path(args.out)
+        self.store = DatasetStore(str(self.out / STATE_FILE))
+        self.summary = RunSummary()
+        self.threshold = (args.dedup_threshold or config.DEDUP_THRESHOLD) if args.dedup else None
+
+    def run(self, chats: List[Chat]) -> None:
+        options = f'filter_noise={self.args.filter_noise};dedup={self.threshold}'
+        todo = []
+        for chat in chats:
+            chat.dataset_id = _fingerprint(chat, options)
+            dataset = self.store.get_dataset(chat.dataset_id)
+            if dataset is not None and dataset['status'] == COMPLETED:
+                self._write_missing(chat)
+                self.summary.resumed += 1
+                continue
+            if dataset is not None:
+                self.store.delete_dataset(chat.dataset_id)
+            todo.append(chat)
+        self._log(f"{len(chats)} chats found, {self.summary.resumed} already done, {len(todo)} to process "
+                  f"with {self.args.workers} workers")
+
+        tmp = tempfile.mkdtemp(prefix='tgjobs-')
+        pool = ProcessPoolExecutor(max_workers=self.args.workers)
+        try:
+            self._process(todo, tmp, pool)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _pages(self, todo: List[Chat], tmp: str) -> Iterator[Tuple[ChatRun, int, Path]]:
+        """Every page of every chat, extracting each chat's archives only when it is reached."""
+        for index, chat in enumerate(todo):
+            run = ChatRun(chat, os.path.join(tmp, str(index)))
+            os.makedirs(run.workdir)
+            self.store.create_dataset(chat.dataset_id, chat.name, RUNNING)
+            try:
+                pages = collect_pages([(path.name, path) for path in chat.files], run.workdir)
+            except ArchiveError as e:
+                run.error = str(e)
+                self._finish(run)
+                continue
+            run.tables = [None] * len(pages)
+            run.remaining = len(pages)
+            self.store.update_dataset(chat.dataset_id, pages_total=len(pages))
+            for page_index, (_, path) in enumerate(pages):
+                yield run, page_index, path
+
+    def _process(self, todo: List[Chat], tmp: str, pool: ProcessPoolExecutor) -> None:
+        pages = self._pages(todo, tmp)
+        in_flight: Dict[Future, Tuple[ChatRun, int, Path]] = {}
+        limit = self.args.workers * PAGES_PER_WORKER
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < limit:
+                page = next(pages, None)
+                if page is None:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(_process_page, page[2], self.args.filter_noise)] = page
+            if not in_flight:
+                return
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                run, page_index, path = in_flight.pop(future)
+                try:
+                    table, stats = future.result()
+                except Exception as e:
+                    run.error = run.error or f'{path.name}: {e}'
+                else:
+                    run.tables[page_index] = table
+                    run.stats.merge(stats)
+                    self.summary.bytes += path.stat().st_size
+                self.summary.pages += 1
+                run.remaining -= 1
+                if not run.remaining:
+                    self._finish(run)
+
+    def _finish(self, run: ChatRun) -> None:
+        """Store a chat's job posts and write its outputs, or record why it failed."""
+        chat = run.chat
+        shutil.rmtree(run.workdir, ignore_errors=True)
+        if run.error is not None:
+            self.summary.failed += 1
+            self.store.update_dataset(chat.dataset_id, status=FAILED, error=run.error,
+                                      finished_at=datetime.now().isoformat())
+            self._log(f"FAILED {chat.name}: {run.error}")
+            return
+
+        job_posts = JobTable()
+        for table in run.tables:
+            job_posts.extend(table)
+        messages = len(job_posts) + run.stats.filtered
+        if self.threshold is not None:
+            job_posts = deduplicate_job_posts(job_posts, self.threshold)
+        self.store.add_job_posts(chat.dataset_id, job_posts)
+        if not self.args.merge:
+            for fmt in self.args.format:
+                rows = job_posts.dicts if fmt == 'excel' else (lambda: job_posts)
+                write_output(rows, fmt, self._output_path(chat, fmt), list(JOB_POST_FIELDS))
+        self.store.update_dataset(chat.dataset_id, status=COMPLETED, finished_at=datetime.now().isoformat(),
+                                  messages_parsed=messages, messages_total=messages,
+                                  pages_done=len(run.tables), messages_filtered=run.stats.filtered)
+
+        summary = self.summary
+        summary.chats += 1
+        summary.messages += messages
+        summary.filtered += run.stats.filtered
+        summary.job_posts += len(job_posts)
+        self._log(f"{chat.name}: {len(job_posts):,} job posts from {messages:,} messages "
+                  f"in {time.perf_counter() - run.started:.1f} s")
+
+    def _output_path(self, chat: Chat, fmt: str) -> str:
+        return f'{self.out / output_name(chat.name)}.{FORMATS[fmt]}'
+
+    def _write_missing(self, chat: Chat) -> None:
+        """
+        Write a finished chat's files in any requested format it has none
+        in yet, such as one added since the chat was processed, from its
+        stored job posts.
+        """
+        if self.args.merge:
+            return
+        for fmt in self.args.format:
+            path = self._output_path(chat, fmt)
+            if not os.path.exists(path):
+                write_output(lambda: self.store.iter_job_posts(chat.dataset_id), fmt, path, list(JOB_POST_FIELDS))
+
+    def write_merged(self, chats: List[Chat]) -> None:
+        """Write every completed chat's job posts into one file per format, with a chat column."""
+        finished = [chat for chat in chats
+                    if (self.store.get_dataset(chat.dataset_id) or {}).get('status') == COMPLETED]
+
+        def job_posts() -> Iterator[Dict[str, Any]]:
+            for chat in finished:
+                for job in self.store.iter_job_posts(chat.dataset_id):
+                    job['chat'] = chat.name
+                    yield job
+
+        for fmt in self.args.format:
+            write_output(job_posts, fmt, str(self.out / f'{MERGED_NAME}.{FORMATS[fmt]}'),
+                         ['chat', *JOB_POST_FIELDS])
+
+    def _log(self, message: str) -> None:
+        if not self.args.quiet:
+            print(message, file=sys.stderr, flush=True)
+
+def format_summary(summary: RunSummary, seconds: float) -> str:
+    messages = summary.messages
+    lines = [
+        f"Chats:     {summary.chats:,} processed, {summary.resumed:,} already done, {summary.failed:,} failed",
+        f"Pages:     {summary.pages:,} ({summary.bytes / 2 ** 20:,.1f} MB)",
+        f"Messages:  {messages:,} ({summary.filtered:,} filtered as noise)",
+        f"Job posts: {summary.job_posts:,}",
+        f"Time:      {seconds:,.1f} s",
+    ]
+    if seconds > 0:
+        lines.append(f"Rate:      {messages / seconds:,.0f} messages/s, {summary.bytes / 2 ** 20 / seconds:,.1f} MB/s")
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.cli', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', type=Path, help='directory of exports (or a single export page or ZIP)')
+    parser.add_argument('--out', type=Path, required=True, help='output directory')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['csv'])
+    parser.add_argument('--merge', action='store_true', help='write one file per format for all chats')
+    parser.add_argument('--workers', type=int, default=config.PARSE_WORKERS, help='worker processes')
+    parser.add_argument('--no-filter-noise', dest='filter_noise', action='store_false',
+                        help='keep messages that are not job postings')
+    parser.add_argument('--dedup', action='store_true', help='fold near-duplicate reposts within each chat')
+    parser.add_argument('--dedup-threshold', type=float)
+    parser.add_argument('--quiet', action='store_true', help='only print the summary')
+    args = parser.parse_args(argv)
+
+    if not args.input.exists():
+        parser.error(f"{args.input} does not exist")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.dedup_threshold is not None and not 0 < args.dedup_threshold <= 1:
+        parser.error("--dedup-threshold must be between 0 and 1")
+    if 'parquet' in args.format and importlib.util.find_spec('pyarrow') is None:
+        parser.error("parquet output requires pyarrow (pip install pyarrow)")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    chats = find_chats(args.input)
+    runner = BatchRunner(args)
+    start = time.perf_counter()
+    try:
+        runner.run(chats)
+        if args.merge:
+            runner.write_merged(chats)
+    except KeyboardInterrupt:
+        print("Interrupted; run again with the same arguments to resume.", file=sys.stderr)
+        print(format_summary(runner.summary, time.perf_counter() - start))
+        return 130
+    print(format_summary(runner.summary, time.perf_counter() - start))
+    return 1 if runner.summary.failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import os
+
+# Worker processes used to parse export pages in parallel (0 = one per CPU core)
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', '0')) or os.cpu_count() or 1
+
+# Uploads processed at the same time; further uploads wait in a queue
+MAX_CONCURRENT_TASKS = int(os.environ.get('MAX_CONCURRENT_TASKS', '2'))
+
+# Uploads allowed to wait for a free slot before new ones are rejected
+MAX_PENDING_TASKS = int(os.environ.get('MAX_PENDING_TASKS', '20'))
+
+# Where uploaded datasets are persisted (shared by all server workers)
+DATA_DIR = os.environ.get('DATA_DIR', os.path.join(os.getcwd(), 'data'))
+DATASET_DB_PATH = os.environ.get('DATASET_DB_PATH', os.path.join(DATA_DIR, 'datasets.sqlite3'))
+
+# Uploads are copied here in chunks of UPLOAD_CHUNK_SIZE bytes and parsed from disk
+UPLOAD_DIR = os.environ.get('UPLOAD_DIR', os.path.join(DATA_DIR, 'uploads'))
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', str(1024 * 1024)))
+
+# Limits on what the ZIP archives of one upload may expand to, so a small
+# archive cannot fill the upload volume: total uncompressed bytes of the
+# extracted pages, and entries across the archives
+MAX_ARCHIVE_BYTES = int(os.environ.get('MAX_ARCHIVE_BYTES', str(2 * 1024 ** 3)))
+MAX_ARCHIVE_MEMBERS = int(os.environ.get('MAX_ARCHIVE_MEMBERS', '10000'))
+
+# Extracted-and-validated messages remembered by text hash (0 disables the cache)
+EXTRACTION_CACHE_SIZE = int(os.environ.get('EXTRACTION_CACHE_SIZE', '100000'))
+
+# Email and phone verdicts remembered by raw value
+VALIDATION_CACHE_SIZE = int(os.environ.get('VALIDATION_CACHE_SIZE', '50000'))
+
+# Optional SQLite file backing the extraction cache across restarts and workers
+EXTRACTION_CACHE_PATH = os.environ.get('EXTRACTION_CACHE_PATH', '')
+EXTRACTION_CACHE_DISK_SIZE = int(os.environ.get('EXTRACTION_CACHE_DISK_SIZE', '1000000'))
+
+# Finished datasets kept in memory as compact tables to serve results and exports
+RESULT_TABLE_CACHE_SIZE = int(os.environ.get('RESULT_TABLE_CACHE_SIZE', '4'))
+
+# Downloads (CSV, NDJSON, Parquet, Excel) are kept here once generated, named
+# by the version of the data they were made from; the least recently served
+# are deleted once they take more than EXPORT_CACHE_MAX_BYTES
+EXPORT_CACHE_DIR = os.environ.get('EXPORT_CACHE_DIR', os.path.join(DATA_DIR, 'exports'))
+EXPORT_CACHE_MAX_BYTES = int(os.environ.get('EXPORT_CACHE_MAX_BYTES', str(1024 ** 3)))
+
+# Near-duplicate detection: estimated Jaccard similarity of word shingles at
+# which reposts are folded together, and MinHash signature length
+DEDUP_THRESHOLD = float(os.environ.get('DEDUP_THRESHOLD', '0.7'))
+DEDUP_NUM_PERM = int(os.environ.get('DEDUP_NUM_PERM', '64'))
+
+# Import the lazily loaded libraries (parsing, validation, Excel, numpy) at
+# startup rather than on the first request that needs them
+WARM_UP = os.environ.get('WARM_UP', '').lower() in ('1', 'true', 'yes')
@@ -1,18 +1,347 @@
-from ..services.parser import parse_html
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from ..services.parser import iter_message_records, HtmlSource
 from ..services.extractor import extract_job_info
 from ..services.cleaner import clean_job_post
+from ..services.extraction_cache import ExtractionCache
+from ..services.noise_filter import is_job_posting
+from ..services import metrics, validation
+from ..services.metrics import StageTimings
 from ..models.job_post import JobPost
-from typing import List
+from ..models.job_table import JobTable
+from .. import config
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-def process_html_file(html_content: str) -> List[JobPost]:
+# Called with (messages processed, pages finished) since the previous call
+ProgressCallback = Callable[[int, int], None]
+
+# Messages between progress reports while processing a page in-process
+PROGRESS_INTERVAL = 500
+
+# Cache counters that pool workers report back with each page
+CACHE_COUNTERS = ('hits', 'misses', 'memory_hits', 'disk_hits', 'evictions')
+
+_pool: Optional[ProcessPoolExecutor] = None
+_cache: Optional[ExtractionCache] = None
+# Counters from pool workers, keyed by (cache, counter); cache is 'extraction' or a validation kind
+_worker_cache_counts: Counter = Counter()
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    The page-parsing worker pool, started on first use. Workers are not
+    forked from the server, whose other threads may hold locks (caches,
+    metrics, SQLite) that a forked child would inherit held forever.
+    """
+    global _pool
+    if _pool is None:
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        _pool = ProcessPoolExecutor(max_workers=config.PARSE_WORKERS,
+                                    mp_context=multiprocessing.get_context(method))
+    return _pool
+
+def shutdown_pool() -> None:
+    """Stop the page-parsing worker processes, if any were started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """The extraction cache of this process, created on first use."""
+    global _cache
+    if _cache is None:
+        _cache = ExtractionCache(config.EXTRACTION_CACHE_SIZE, config.EXTRACTION_CACHE_PATH,
+                                 config.EXTRACTION_CACHE_DISK_SIZE)
+    return _cache
+
+def cache_stats() -> Dict[str, Any]:
+    """Extraction cache statistics, including lookups made in pool workers."""
+    stats = get_extraction_cache().stats()
+    for name in CACHE_COUNTERS:
+        stats[name] += _worker_cache_counts['extraction', name]
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+    return stats
+
+def validation_stats() -> Dict[str, Dict[str, Any]]:
+    """Email and phone verdict cache statistics, including lookups made in pool workers."""
+    all_stats = validation.validation_stats()
+    for kind, stats in all_stats.items():
+        for name in validation.VALIDATION_COUNTERS:
+            stats[name] += _worker_cache_counts[kind, name]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+    return all_stats
+
+def _cache_counts() -> Dict[Tuple[str, str], int]:
+    """Current cache counters of this process, keyed like _worker_cache_counts."""
+    stats = get_extraction_cache().stats()
+    counts = {('extraction', name): stats[name] for name in CACHE_COUNTERS}
+    for kind, stats in validation.validation_stats().items():
+        counts.update({(kind, name): stats[name] for name in validation.VALIDATION_COUNTERS})
+    return counts
+
+def message_record(text: str, timings: Optional[StageTimings] = None) -> Dict[str, Any]:
+    """
+    Extract and clean one message into a dict of JobPost fields, reusing
+    the fields extracted from the same text before. The cache holds every
+    field but the description, which is the message text itself and is
+    attached again on a hit. With `timings`, each step is timed as a stage.
+    """
+    if timings is None:
+        timings = StageTimings()
+    clock = time.perf_counter
+    cache = get_extraction_cache()
+    start = clock()
+    fields = cache.get(text)
+    now = clock()
+    timings.observe('cache', now - start)
+    if fields is None:
+        raw_data = extract_job_info(text)
+        start = clock()
+        timings.observe('extract', start - now)
+        cleaned_data = clean_job_post(raw_data, timings)
+        cache.put(text, {name: value for name, value in cleaned_data.items() if name != 'job_description'})
+        timings.observe('cache', clock() - start)
+        return cleaned_data
+    return {**fields, 'job_description': text.strip()}
+
+def process_message(text: str, timings: Optional[StageTimings] = None) -> JobPost:
+    """Extract and clean one message into a JobPost; see message_record."""
+    return JobPost(**message_record(text, timings))
+
+@dataclass
+class IngestStats:
+    """
+    What an ingest skipped (already ingested) and filtered (noise), the
+    highest message ID it saw per chat, and where its time went.
+    """
+    skipped: int = 0
+    filtered: int = 0
+    max_message_ids: Dict[str, int] = field(default_factory=dict)
+    timings: StageTimings = field(default_factory=StageTimings)
+
+    def see(self, chat: str, message_id: int) -> None:
+        if message_id > self.max_message_ids.get(chat, message_id - 1):
+            self.max_message_ids[chat] = message_id
+
+    def merge(self, other: 'IngestStats') -> None:
+        self.skipped += other.skipped
+        self.filtered += other.filtered
+        for chat, message_id in other.max_message_ids.items():
+            self.see(chat, message_id)
+        self.timings.merge(other.timings)
+
+def iter_html_file(
+    html_content: HtmlSource,
+    on_progress: Optional[ProgressCallback] = None,
+    watermarks: Optional[Dict[str, int]] = None,
+    chat: Optional[str] = None,
+    stats: Optional[IngestStats] = None,
+    filter_noise: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Process HTML content: parse, extract and clean it, yielding a record
+    (see message_record) per message as soon as it is ready. Messages are
+    streamed out of the export one at a time, so the document itself is
+    never held as a full tree.
+
+    With `watermarks` (highest message ID already ingested per chat), older
+    messages are skipped before extraction. `chat` overrides the chat title
+    read from the export; `stats` collects skip counts, the highest ID
+    seen per chat and per-stage timings.
+
+    With `filter_noise`, messages that are not job postings (join notices,
+    pins, media placeholders, chatter) are counted in `stats.filtered` and
+    dropped before extraction.
+    """
+    stats = stats if stats is not None else IngestStats()
+    timings = stats.timings
+    clock = time.perf_counter
+    parsed = 0
+    start = clock()
+    for message in iter_message_records(html_content):
+        timings.observe('parse', clock() - start)
+        parsed += 1
+        if on_progress and parsed % PROGRESS_INTERVAL == 0:
+            on_progress(PROGRESS_INTERVAL, 0)
+        chat_key = chat or message.chat
+        if chat_key and message.id is not None:
+            if watermarks is not None and message.id <= watermarks.get(chat_key, message.id - 1):
+                stats.skipped += 1
+                start = clock()
+                continue
+            stats.see(chat_key, message.id)
+        if filter_noise:
+            start = clock()
+            keep = is_job_posting(message.text)
+            timings.observe('filter', clock() - start)
+            if not keep:
+                stats.filtered += 1
+                start = clock()
+                continue
+        yield message_record(message.text, timings)
+        start = clock()
+    get_extraction_cache().flush()
+    if on_progress:
+        on_progress(parsed % PROGRESS_INTERVAL, 1)
+
+def process_html_file(
+    html_content: HtmlSource,
+    on_progress: Optional[ProgressCallback] = None,
+    watermarks: Optional[Dict[str, int]] = None,
+    chat: Optional[str] = None,
+    stats: Optional[IngestStats] = None,
+    filter_noise: bool = False,
+) -> JobTable:
+    """Process HTML content and return its job posts as a JobTable; see iter_html_file."""
+    return JobTable.from_records(iter_html_file(html_content, on_progress, watermarks, chat, stats, filter_noise))
+
+def _process_page_in_worker(
+    html_content: HtmlSource, watermarks: Optional[Dict[str, int]], chat: Optional[str], filter_noise: bool
+) -> Tuple[JobTable, Dict[Tuple[str, str], int], IngestStats]:
+    """Pool entry point: process a page and report cache counter deltas and ingest stats."""
+    before = _cache_counts()
+    stats = IngestStats()
+    job_posts = process_html_file(html_content, watermarks=watermarks, chat=chat, stats=stats,
+                                  filter_noise=filter_noise)
+    after = _cache_counts()
+    return job_posts, {key: after[key] - before[key] for key in after}, stats
+
+def deduplicate_job_posts(job_posts: JobTable, threshold: float) -> JobTable:
+    """
+    Fold near-duplicate reposts into the earliest post of each group and
+    record on it how many reposts were folded in.
+    """
+    from ..services.dedup import find_near_duplicates
+
+    descriptions = [description or '' for description in job_posts.column('job_description')]
+    groups = find_near_duplicates(descriptions, threshold, config.DEDUP_NUM_PERM).tolist()
+    sizes = Counter(groups)
+    canonical = [index for index, group in enumerate(groups) if group == index]
+    deduplicated = job_posts.select(canonical)
+    deduplicated.columns['repost_count'] = [sizes[index] - 1 for index in canonical]
+    return deduplicated
+
+def process_html_files(
+    pages: List[HtmlSource],
+    on_progress: Optional[ProgressCallback] = None,
+    watermarks: Optional[Dict[str, int]] = None,
+    chat: Optional[str] = None,
+    stats: Optional[IngestStats] = None,
+    dedup_threshold: Optional[float] = None,
+    filter_noise: bool = False,
+) -> JobTable:
+    """
+    Process the pages of a split export in parallel across the worker
+    pool and merge the results in original page order. With
+    `dedup_threshold`, near-duplicate reposts are then folded together;
+    `filter_noise` is passed on to process_html_file.
+
+    Stage timings, message counts and throughput are recorded in the
+    metrics registry as well as in `stats`.
+    """
+    stats = stats if stats is not None else IngestStats()
+    run_stats = IngestStats()
+    start = time.perf_counter()
+    if not _use_pool(pages):
+        job_posts = JobTable.from_records(
+            record for page in pages
+            for record in iter_html_file(page, on_progress, watermarks, chat, run_stats, filter_noise)
+        )
+    else:
+        job_posts = _process_in_pool(pages, on_progress, watermarks, chat, run_stats, filter_noise)
+    _record_ingest(run_stats, len(job_posts), time.perf_counter() - start)
+    stats.merge(run_stats)
+    if dedup_threshold is not None:
+        with metrics.stage('dedup', stats.timings):
+            job_posts = deduplicate_job_posts(job_posts, dedup_threshold)
+    return job_posts
+
+def iter_html_files(
+    pages: List[HtmlSource],
+    on_progress: Optional[ProgressCallback] = None,
+    watermarks: Optional[Dict[str, int]] = None,
+    chat: Optional[str] = None,
+    stats: Optional[IngestStats] = None,
+    filter_noise: bool = False,
+) -> Iterator[Dict[str, Any]]:
     """
-    Process HTML content: parse, extract, clean, and return list of JobPost objects.
+    Process the pages of an export in order, yielding each record (see
+    message_record) as soon as it is available, for callers that stream
+    results instead of waiting for the whole export. Pages are parsed
+    across the worker pool when process_html_files would use it, and their
+    records yielded page by page; otherwise records are yielded one by one
+    as this process extracts them.
     """
-    messages = parse_html(html_content)
-    job_posts = []
-    for msg in messages:
-        raw_data = extract_job_info(msg)
-        cleaned_data = clean_job_post(raw_data)
-        job_post = JobPost(**cleaned_data)
-        job_posts.append(job_post)
-    return job_posts
\ No newline at end of file
+    stats = stats if stats is not None else IngestStats()
+    run_stats = IngestStats()
+    if _use_pool(pages):
+        records = (record for page_posts in _iter_pool_pages(pages, on_progress, watermarks, chat,
+                                                             run_stats, filter_noise)
+                   for record in page_posts.dicts())
+    else:
+        records = (record for page in pages
+                   for record in iter_html_file(page, on_progress, watermarks, chat, run_stats, filter_noise))
+    produced = 0
+    elapsed = 0.0
+    try:
+        start = time.perf_counter()
+        for record in records:
+            elapsed += time.perf_counter() - start
+            produced += 1
+            yield record
+            start = time.perf_counter()
+        elapsed += time.perf_counter() - start
+    finally:
+        records.close()
+        _record_ingest(run_stats, produced, elapsed)
+        stats.merge(run_stats)
+
+def _use_pool(pages: List[HtmlSource]) -> bool:
+    """Whether pages are worth sending to the worker pool; open file objects cannot be."""
+    return len(pages) > 1 and config.PARSE_WORKERS != 1 and not any(hasattr(page, 'read') for page in pages)
+
+def _record_ingest(run_stats: IngestStats, produced: int, elapsed: float) -> None:
+    """Record an ingest's stage timings, message counts and throughput in the metrics registry."""
+    metrics.record(run_stats.timings)
+    processed = produced + run_stats.skipped + run_stats.filtered
+    metrics.inc('messages_processed', processed)
+    metrics.inc('ingest_seconds', elapsed)
+    if elapsed:
+        metrics.set_gauge('last_ingest_messages_per_second', processed / elapsed)
+
+def _process_in_pool(
+    pages: List[HtmlSource],
+    on_progress: Optional[ProgressCallback],
+    watermarks: Optional[Dict[str, int]],
+    chat: Optional[str],
+    stats: IngestStats,
+    filter_noise: bool,
+) -> JobTable:
+    job_posts = JobTable()
+    for page_posts in _iter_pool_pages(pages, on_progress, watermarks, chat, stats, filter_noise):
+        job_posts.extend(page_posts)
+    return job_posts
+
+def _iter_pool_pages(
+    pages: List[HtmlSource],
+    on_progress: Optional[ProgressCallback],
+    watermarks: Optional[Dict[str, int]],
+    chat: Optional[str],
+    stats: IngestStats,
+    filter_noise: bool,
+) -> Iterator[JobTable]:
+    """Parse pages across the worker pool, yielding each page's job posts in page order."""
+    results = _get_pool().map(_process_page_in_worker, pages, repeat(watermarks), repeat(chat),
+                              repeat(filter_noise))
+    for page_posts, cache_counts, page_stats in results:
+        _worker_cache_counts.update(cache_counts)
+        stats.merge(page_stats)
+        if on_progress:
+            on_progress(len(page_posts) + page_stats.skipped + page_stats.filtered, 1)
+        yield page_posts
@@ -1,6 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .views.job_routes import router as job_router
+from fastapi.responses import PlainTextResponse
+from .views.job_routes import router as job_router, task_manager, export_cache
+from .controllers.job_controller import shutdown_pool, cache_stats, validation_stats
+from .services import metrics
+from .warmup import warm_up
+from . import config
 
 app = FastAPI(title="Telegram Job Post Extractor")
 
@@ -11,10 +16,40 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Dataset-Id"],
 )
 
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """With an X-Profile header, return the request's stage breakdown in a Server-Timing header."""
+    if not request.headers.get("x-profile"):
+        return await call_next(request)
+    profile = metrics.start_profile()
+    response = await call_next(request)
+    if profile.stages:
+        response.headers["Server-Timing"] = metrics.server_timing(profile)
+    return response
+
 app.include_router(job_router, prefix="/api", tags=["jobs"])
 
+@app.on_event("startup")
+def start_up():
+    task_manager.fail_orphaned()
+    if config.WARM_UP:
+        warm_up()
+
+@app.on_event("shutdown")
+def stop_workers():
+    task_manager.shutdown()
+    shutdown_pool()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Stage latency histograms, throughput and cache counters in the Prometheus text format"""
+    caches = {'extraction': cache_stats(), 'exports': export_cache.stats(),
+              **{f'{kind}_validation': stats for kind, stats in validation_stats().items()}}
+    return PlainTextResponse(metrics.render(caches), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     return {"message": "Telegram Job Post Extractor API"}
\ No newline at end of file
@@ -11,4 +11,14 @@ class JobPost(BaseModel):
     date_of_posting: Optional[str] = None
     job_description: Optional[str] = None
     link: Optional[str] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+    # Near-duplicates of this post that were folded into it (set when deduplicating)
+    repost_count: Optional[int] = None
+
+# Column order used by the dataset store and exports
+JOB_POST_FIELDS = tuple(JobPost.__annotations__)
+INTEGER_FIELDS = frozenset(name for name, kind in JobPost.__annotations__.items() if kind == Optional[int])
+
+# Fields that can be searched on exactly (case-insensitive) and counted as
+# facets; email_domain is the part of the email after the @
+SEARCH_FIELDS = ('company', 'location', 'job_title', 'email_domain', 'date_of_posting')
@@ -0,0 +1,126 @@
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+import hashlib
+import orjson
+from .job_post import JOB_POST_FIELDS
+
+# Columns whose values repeat across posts (the same recruiter, company or
+# city again and again); each distinct value is stored once per table
+INTERNED_FIELDS = frozenset([
+    'name', 'email', 'phone', 'job_title', 'company', 'location', 'date_of_posting', 'notes',
+])
+
+_FIELD_SET = frozenset(JOB_POST_FIELDS)
+
+class JobRow:
+    """
+    A view of one row of a JobTable, read and written like a JobPost
+    (`row.company`, `row.repost_count = 2`, `row.dict()`) without copying it.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table: 'JobTable', index: int):
+        object.__setattr__(self, '_table', table)
+        object.__setattr__(self, '_index', index)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _FIELD_SET:
+            return self._table.columns[name][self._index]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in _FIELD_SET:
+            raise AttributeError(name)
+        self._table.columns[name][self._index] = value
+
+    def dict(self) -> Dict[str, Any]:
+        columns = self._table.columns
+        return {name: columns[name][self._index] for name in JOB_POST_FIELDS}
+
+    def __repr__(self) -> str:
+        return f'JobRow({self.dict()!r})'
+
+class JobTable:
+    """
+    Job posts stored column by column, one list per JobPost field, with
+    repeated values of INTERNED_FIELDS shared. Much smaller than a list of
+    JobPost models, and rows, dicts or JSON can be produced straight from it.
+    """
+    __slots__ = ('columns', '_pools')
+
+    def __init__(self):
+        self.columns: Dict[str, List[Any]] = {name: [] for name in JOB_POST_FIELDS}
+        self._pools: Dict[str, Dict[Any, Any]] = {name: {} for name in INTERNED_FIELDS}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> 'JobTable':
+        table = cls()
+        for record in records:
+            table.append(record)
+        return table
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add a post given as a dict of JobPost fields; missing fields are None."""
+        self.append_row([record.get(name) for name in JOB_POST_FIELDS])
+
+    def append_row(self, row: Sequence[Any]) -> None:
+        """Add a post given as values in JOB_POST_FIELDS order."""
+        pools = self._pools
+        for name, value in zip(JOB_POST_FIELDS, row):
+            pool = pools.get(name)
+            if pool is not None and value is not None:
+                value = pool.setdefault(value, value)
+            self.columns[name].append(value)
+
+    def extend(self, other: 'JobTable') -> None:
+        for row in other.rows():
+            self.append_row(row)
+
+    def select(self, indices: Iterable[int]) -> 'JobTable':
+        """A new table of the given rows, in the given order."""
+        table = JobTable()
+        indices = list(indices)
+        for name, column in self.columns.items():
+            table.columns[name] = [column[i] for i in indices]
+        table._pools = self._pools
+        return table
+
+    def __len__(self) -> int:
+        return len(self.columns[JOB_POST_FIELDS[0]])
+
+    def __getitem__(self, index: int) -> JobRow:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return JobRow(self, index % len(self))
+
+    def __iter__(self) -> Iterator[JobRow]:
+        return (JobRow(self, index) for index in range(len(self)))
+
+    def column(self, name: str) -> List[Any]:
+        return self.columns[name]
+
+    def rows(self) -> Iterator[Tuple[Any, ...]]:
+        """Rows as tuples in JOB_POST_FIELDS order."""
+        return zip(*self.columns.values())
+
+    def dicts(self) -> Iterator[Dict[str, Any]]:
+        """Rows as fresh dicts, like JobPost.dict()."""
+        return (dict(zip(JOB_POST_FIELDS, row)) for row in self.rows())
+
+    def to_json(self) -> bytes:
+        """The table as a JSON array of objects."""
+        return orjson.dumps(list(self.dicts()))
+
+    def digests(self) -> Dict[str, str]:
+        """A hash of each column's values, so two versions of a table can be compared column by column."""
+        return {name: hashlib.blake2b(orjson.dumps(values), digest_size=16).hexdigest()
+                for name, values in self.columns.items()}
+
+    def __getstate__(self) -> Dict[str, List[Any]]:
+        # Pickle keeps one copy of each shared value, so interning survives
+        # the trip to and from pool workers without sending the pools
+        return self.columns
+
+    def __setstate__(self, columns: Dict[str, List[Any]]) -> None:
+        self.columns = columns
+        self._pools = {name: {value: value for value in columns[name] if value is not None}
+                       for name in INTERNED_FIELDS}
@@ -0,0 +1,107 @@
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, List, Tuple, Union
+from .. import config
+
+# Telegram Desktop names pages messages.html, messages2.html, ... messagesN.html
+_PAGE_RE = re.compile(r'^messages(\d*)\.html$', re.IGNORECASE)
+_DIGITS_RE = re.compile(r'(\d+)')
+
+# Bytes copied at a time when extracting archive members
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# An uploaded file, as a path on disk or an open binary file
+UploadSource = Union[Path, BinaryIO]
+
+class ArchiveError(ValueError):
+    """Raised when an upload does not contain any usable export pages."""
+
+class ArchiveTooLarge(ArchiveError):
+    """Raised when archives expand past MAX_ARCHIVE_BYTES or hold more than MAX_ARCHIVE_MEMBERS entries."""
+
+class _Budget:
+    """What the archives of one upload may still expand to."""
+
+    def __init__(self, max_bytes: int, max_members: int):
+        self.bytes = max_bytes
+        self.members = max_members
+
+    def take_members(self, filename: str, count: int) -> None:
+        self.members -= count
+        if self.members < 0:
+            raise ArchiveTooLarge(f"{filename} has too many entries")
+
+    def take_bytes(self, filename: str, count: int) -> None:
+        self.bytes -= count
+        if self.bytes < 0:
+            raise ArchiveTooLarge(f"{filename} expands past the upload size limit")
+
+def page_sort_key(path: str) -> Tuple:
+    """
+    Order export pages the way Telegram numbered them, grouping pages
+    of the same chat directory together.
+    """
+    directory, name = os.path.split(path.replace('\\', '/'))
+    page = _PAGE_RE.match(name)
+    if page:
+        name_key = ('', int(page.group(1) or 1))
+    else:
+        name_key = tuple(int(p) if p.isdigit() else p.lower() for p in _DIGITS_RE.split(name))
+    dir_key = tuple(int(p) if p.isdigit() else p.lower() for p in _DIGITS_RE.split(directory))
+    return dir_key, name_key
+
+def _zip_pages(filename: str, source: UploadSource, workdir: str, prefix: str,
+               budget: _Budget) -> List[Tuple[str, Path]]:
+    """
+    Extract the HTML pages of an archive into workdir as prefix-N.html,
+    streaming each member to disk. Bytes are counted as they are written,
+    since the sizes an archive declares cannot be trusted.
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile:
+        raise ArchiveError(f"{filename} is not a valid ZIP archive")
+    pages = []
+    with archive:
+        members = archive.infolist()
+        budget.take_members(filename, len(members))
+        for info in members:
+            if info.is_dir() or not info.filename.lower().endswith('.html') \
+                    or os.path.basename(info.filename).startswith('.'):
+                continue
+            # Members are written under generated names; archive paths are never trusted
+            target = Path(workdir, f'{prefix}-{len(pages)}.html')
+            with archive.open(info) as src, open(target, 'wb') as dst:
+                while True:
+                    chunk = src.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    budget.take_bytes(filename, len(chunk))
+                    dst.write(chunk)
+            pages.append((info.filename, target))
+    return pages
+
+def collect_pages(files: List[Tuple[str, UploadSource]], workdir: str,
+                  max_bytes: int = config.MAX_ARCHIVE_BYTES,
+                  max_members: int = config.MAX_ARCHIVE_MEMBERS) -> List[Tuple[str, UploadSource]]:
+    """
+    Expand uploaded .html files and .zip archives, given as (filename, path
+    on disk or open file), into a list of (name, source) export pages in
+    original message order. HTML files are returned as given; archive
+    members are extracted into workdir. ArchiveTooLarge is raised once the
+    archives hold more than `max_members` entries or their pages more than
+    `max_bytes` in all.
+    """
+    budget = _Budget(max_bytes, max_members)
+    pages = []
+    for index, (filename, source) in enumerate(files):
+        if filename.lower().endswith('.zip'):
+            pages.extend(_zip_pages(filename, source, workdir, f'archive{index}', budget))
+        else:
+            pages.append((filename, source))
+    if not pages:
+        raise ArchiveError("No HTML export pages found in upload")
+    pages.sort(key=lambda page: page_sort_key(page[0]))
+    return pages
@@ -1,35 +1,32 @@
-from email_validator import validate_email, EmailNotValidError
-import phonenumbers
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
+from .metrics import StageTimings
+from .validation import normalize_email, normalize_phone
 
-def clean_job_post(data: Dict[str, Any]) -> Dict[str, Any]:
+def clean_job_post(data: Dict[str, Any], timings: Optional[StageTimings] = None) -> Dict[str, Any]:
     """
     Validate and clean job post data.
+    With `timings`, email and phone validation are timed as separate stages.
     """
     cleaned = data.copy()
 
     # Validate and normalize email
     if cleaned.get('email'):
-        try:
-            valid = validate_email(cleaned['email'])
-            cleaned['email'] = valid.email
-        except EmailNotValidError:
-            cleaned['email'] = None
+        start = time.perf_counter()
+        cleaned['email'] = normalize_email(cleaned['email'])
+        if timings is not None:
+            timings.observe('validate_email', time.perf_counter() - start)
 
-    # Validate phone
+    # Validate phone and format it internationally
     if cleaned.get('phone'):
-        try:
-            parsed = phonenumbers.parse(cleaned['phone'], None)
-            if not phonenumbers.is_valid_number(parsed):
-                cleaned['phone'] = None
-            else:
-                cleaned['phone'] = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-        except:
-            cleaned['phone'] = None
+        start = time.perf_counter()
+        cleaned['phone'] = normalize_phone(cleaned['phone'])
+        if timings is not None:
+            timings.observe('validate_phone', time.perf_counter() - start)
 
     # Strip whitespace from strings
     for key, value in cleaned.items():
         if isinstance(value, str):
             cleaned[key] = value.strip()
 
-    return cleaned
\ No newline at end of file
+    return cleaned
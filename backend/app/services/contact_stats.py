@@ -0,0 +1,77 @@
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Set
+
+from .excel_exporter import ExcelExporter
+
+# Contacts kept as a sample (the first ones found) in a dataset's statistics
+SAMPLE_SIZE = 100
+
+# Most common email domains and companies kept in a dataset's statistics
+TOP_SIZE = 50
+
+class ContactStats:
+    """
+    Contact statistics of a dataset, over the same contacts that the
+    contacts workbook lists, accumulated one job post at a time while the
+    dataset is ingested. summary() is what the store keeps, so reading
+    them back never touches the job posts.
+    """
+
+    def __init__(self):
+        self.total_jobs = 0
+        self.jobs_with_contacts = 0
+        self.total_contacts = 0
+        self.total_emails = 0
+        self.total_names = 0
+        self.emails: Set[str] = set()
+        self.names: Set[str] = set()
+        self.email_domains: Counter = Counter()
+        self.companies: Counter = Counter()
+        self.sample: List[Dict[str, Any]] = []
+        self._exporter = ExcelExporter()
+        self._extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def add(self, job: Dict[str, Any]) -> None:
+        """Count the contacts of the next job post of the dataset."""
+        contacts = self._exporter.job_contacts(job)
+        found = False
+        for contact in self._exporter.contact_rows(self.total_jobs, job, contacts, self._extraction_date):
+            found = True
+            self.total_contacts += 1
+            if contact['Email']:
+                self.total_emails += 1
+                self.emails.add(contact['Email'])
+                self.email_domains[contact['Email'].rsplit('@', 1)[-1].lower()] += 1
+            if contact['Name']:
+                self.total_names += 1
+                self.names.add(contact['Name'])
+            if len(self.sample) < SAMPLE_SIZE:
+                self.sample.append(contact)
+        self.total_jobs += 1
+        if found:
+            self.jobs_with_contacts += 1
+        if job.get('company'):
+            self.companies[job['company']] += 1
+
+    def add_all(self, jobs: Iterable[Dict[str, Any]]) -> 'ContactStats':
+        for job in jobs:
+            self.add(job)
+        return self
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts so far, the TOP_SIZE most common email domains and companies, and the sample."""
+        return {
+            'total_jobs': self.total_jobs,
+            'jobs_with_contacts': self.jobs_with_contacts,
+            'total_contacts_found': self.total_contacts,
+            'total_emails': self.total_emails,
+            'total_names': self.total_names,
+            'unique_emails': len(self.emails),
+            'unique_names': len(self.names),
+            'top_email_domains': [{'value': value, 'count': count}
+                                  for value, count in self.email_domains.most_common(TOP_SIZE)],
+            'top_companies': [{'value': value, 'count': count}
+                              for value, count in self.companies.most_common(TOP_SIZE)],
+            'sample_contacts': self.sample,
+        }
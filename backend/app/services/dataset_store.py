@@ -0,0 +1,253 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from ..models.job_post import JobPost, JOB_POST_FIELDS, INTEGER_FIELDS
+from ..models.job_table import JobTable
+
+# Rows fetched per round trip when reading a dataset back
+FETCH_SIZE = 1000
+
+DATASET_FIELDS = (
+    'id', 'filename', 'status', 'messages_parsed', 'messages_total',
+    'pages_done', 'pages_total', 'error', 'created_at', 'finished_at',
+    'messages_skipped', 'stage_seconds', 'messages_filtered', 'column_digests', 'contact_stats',
+    'owner',
+)
+
+def _column_type(field_name: str) -> str:
+    return 'INTEGER' if field_name in INTEGER_FIELDS else 'TEXT'
+
+# Columns added after the first release, created on open when missing
+_ADDED_COLUMNS = {
+    'datasets': [
+        ('messages_skipped', 'INTEGER NOT NULL DEFAULT 0'),
+        ('stage_seconds', 'TEXT'),
+        ('messages_filtered', 'INTEGER NOT NULL DEFAULT 0'),
+        # JSON of JobTable.digests(), filled in on first export; cleared when posts are added
+        ('column_digests', 'TEXT'),
+        # JSON of ContactStats.summary(), written when ingest finishes; cleared when posts are added
+        ('contact_stats', 'TEXT'),
+        # host:pid of the server process running the upload, to find uploads orphaned by a crash
+        ('owner', 'TEXT'),
+    ],
+    'job_posts': [(name, _column_type(name)) for name in JOB_POST_FIELDS],
+}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS datasets (
+    id TEXT PRIMARY KEY,
+    filename TEXT,
+    status TEXT NOT NULL,
+    messages_parsed INTEGER NOT NULL DEFAULT 0,
+    messages_total INTEGER,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    pages_total INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS job_posts (
+    dataset_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    {', '.join(f'{name} {_column_type(name)}' for name in JOB_POST_FIELDS)},
+    PRIMARY KEY (dataset_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chat_watermarks (
+    chat TEXT PRIMARY KEY,
+    max_message_id INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+class DatasetStore:
+    """
+    SQLite-backed store of uploaded datasets and their job posts, keyed by
+    dataset (upload) ID. Safe to share between threads and between server
+    worker processes using the same file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        # The file and schema are created on first use, so constructing a
+        # store (as importing the server does) never touches the disk
+        self._ready = False
+        self._init_lock = threading.Lock()
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.executescript(_SCHEMA)
+            for table, columns in _ADDED_COLUMNS.items():
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+                for name, definition in columns:
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            with self._init_lock:
+                if not self._ready and self.path != ':memory:':
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                if not self._ready:
+                    self._create_schema(conn)
+                    self._ready = True
+            self._local.conn = conn
+        return conn
+
+    def create_dataset(self, dataset_id: str, filename: str, status: str, **fields: Any) -> None:
+        values = {'id': dataset_id, 'filename': filename, 'status': status,
+                  'created_at': datetime.now().isoformat(), **fields}
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT INTO datasets ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})",
+                tuple(values.values()),
+            )
+
+    def update_dataset(self, dataset_id: str, **fields: Any) -> None:
+        assignments = ', '.join(f'{name} = ?' for name in fields)
+        with self._connection() as conn:
+            conn.execute(f"UPDATE datasets SET {assignments} WHERE id = ?", (*fields.values(), dataset_id))
+
+    def get_dataset(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            f"SELECT {', '.join(DATASET_FIELDS)} FROM datasets WHERE id = ?", (dataset_id,)
+        ).fetchone()
+        return dict(zip(DATASET_FIELDS, row)) if row else None
+
+    def find_datasets(self, statuses: Iterable[str]) -> List[Dict[str, Any]]:
+        """Every dataset whose status is one of `statuses`."""
+        statuses = list(statuses)
+        rows = self._connection().execute(
+            f"SELECT {', '.join(DATASET_FIELDS)} FROM datasets "
+            f"WHERE status IN ({', '.join('?' * len(statuses))})",
+            statuses,
+        ).fetchall()
+        return [dict(zip(DATASET_FIELDS, row)) for row in rows]
+
+    def delete_dataset(self, dataset_id: str) -> None:
+        """Remove a dataset and its job posts."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM job_posts WHERE dataset_id = ?", (dataset_id,))
+            conn.execute("DELETE FROM datasets WHERE id = ?", (dataset_id,))
+
+    def delete_job_posts(self, dataset_id: str) -> None:
+        """Remove a dataset's job posts, keeping its record."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM job_posts WHERE dataset_id = ?", (dataset_id,))
+            conn.execute("UPDATE datasets SET column_digests = NULL WHERE id = ?", (dataset_id,))
+
+    def add_job_posts(self, dataset_id: str, job_posts: Union[JobTable, Iterable[JobPost]]) -> int:
+        """
+        Append job posts to a dataset in one transaction; returns how many
+        were added. Its column digests are cleared, to be recomputed on the
+        next export. Its contact statistics are left alone: they are
+        recorded once the last posts are in, so an ingest in progress has
+        none to clear.
+        """
+        if isinstance(job_posts, JobTable):
+            values = job_posts.rows()
+        else:
+            values = (tuple(getattr(job, name) for name in JOB_POST_FIELDS) for job in job_posts)
+        with self._connection() as conn:
+            start = conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM job_posts WHERE dataset_id = ?", (dataset_id,)
+            ).fetchone()[0]
+            rows = ((dataset_id, seq, *row) for seq, row in enumerate(values, start))
+            cursor = conn.executemany(
+                f"INSERT INTO job_posts (dataset_id, seq, {', '.join(JOB_POST_FIELDS)}) "
+                f"VALUES ({', '.join('?' * (len(JOB_POST_FIELDS) + 2))})",
+                rows,
+            )
+            conn.execute("UPDATE datasets SET column_digests = NULL WHERE id = ?",
+                         (dataset_id,))
+            return cursor.rowcount
+
+    def count_job_posts(self, dataset_id: str) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM job_posts WHERE dataset_id = ?", (dataset_id,)
+        ).fetchone()[0]
+
+    def iter_job_posts(self, dataset_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield a dataset's job posts as dicts, in original message order,
+        fetching FETCH_SIZE rows at a time. The generator reads through its
+        own connection, so it may be resumed from any thread (as streaming
+        responses do).
+        """
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        try:
+            cursor = conn.execute(
+                f"SELECT {', '.join(JOB_POST_FIELDS)} FROM job_posts WHERE dataset_id = ? ORDER BY seq",
+                (dataset_id,),
+            )
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(JOB_POST_FIELDS, row))
+        finally:
+            conn.close()
+
+    def load_job_table(self, dataset_id: str) -> JobTable:
+        """Read a dataset's job posts into a JobTable, in original message order."""
+        table = JobTable()
+        cursor = self._connection().execute(
+            f"SELECT {', '.join(JOB_POST_FIELDS)} FROM job_posts WHERE dataset_id = ? ORDER BY seq",
+            (dataset_id,),
+        )
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                return table
+            for row in rows:
+                table.append_row(row)
+
+    def get_watermarks(self) -> Dict[str, int]:
+        """Highest message ID ingested so far, per chat."""
+        return dict(self._connection().execute("SELECT chat, max_message_id FROM chat_watermarks"))
+
+    def update_watermarks(self, watermarks: Dict[str, int]) -> None:
+        """Raise per-chat watermarks; they never move backwards."""
+        now = datetime.now().isoformat()
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT INTO chat_watermarks (chat, max_message_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(chat) DO UPDATE SET "
+                "max_message_id = MAX(max_message_id, excluded.max_message_id), updated_at = excluded.updated_at",
+                [(chat, message_id, now) for chat, message_id in watermarks.items()],
+            )
+
+    def advance_watermarks(self, expected: Dict[str, int], watermarks: Dict[str, int]) -> List[str]:
+        """
+        Raise per-chat watermarks, but only if each still has the value an
+        incremental ingest read when it started (`expected`; missing for a
+        chat seen for the first time). This compare-and-set stops two
+        concurrent ingests of one chat from both committing the same
+        messages. Returns the chats whose watermark moved in the meantime;
+        if there are any, nothing is written.
+        """
+        now = datetime.now().isoformat()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = dict(conn.execute("SELECT chat, max_message_id FROM chat_watermarks"))
+            moved = [chat for chat in watermarks if current.get(chat) != expected.get(chat)]
+            if not moved:
+                conn.executemany(
+                    "INSERT INTO chat_watermarks (chat, max_message_id, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(chat) DO UPDATE SET "
+                    "max_message_id = MAX(max_message_id, excluded.max_message_id), updated_at = excluded.updated_at",
+                    [(chat, message_id, now) for chat, message_id in watermarks.items()],
+                )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return moved
@@ -0,0 +1,128 @@
+import re
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Shingles hashed per numpy batch (bounds the temporary arrays to a few MB)
+BATCH_SHINGLES = 1 << 16
+
+_TOKEN_RE = re.compile(r'\w+')
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32
+_MIX = (np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F), np.uint64(0x165667B19E3779F9))
+_EMPTY = np.uint32(0xFFFFFFFF)
+_MASK64 = (1 << 64) - 1
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Split a signature into (bands, rows). Picks the split whose detection
+    threshold (1/bands) ** (1/rows) is the highest one not above `threshold`,
+    favouring recall; candidates are verified against `threshold` afterwards.
+    """
+    best = (num_perm, 1)
+    best_cut = 0.0
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        cut = (1 / bands) ** (1 / rows)
+        if best_cut < cut <= threshold:
+            best, best_cut = (bands, rows), cut
+    return best
+
+class MinHasher:
+    """Computes MinHash signatures of word-shingled texts."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+
+    @staticmethod
+    def _token_ids(text: str) -> List[int]:
+        # str hashes are stable within a process, which is all one run needs
+        return [hash(token) & _MASK64 for token in _TOKEN_RE.findall(text.lower())]
+
+    def _shingle_hashes(self, docs: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashes of every word shingle of a batch, plus each doc's offset into them."""
+        # Docs shorter than a shingle become a single padded shingle
+        docs = [ids + [0] * (SHINGLE_SIZE - len(ids)) if len(ids) < SHINGLE_SIZE else ids for ids in docs]
+        lengths = np.fromiter((len(ids) for ids in docs), dtype=np.int64, count=len(docs))
+        flat = np.fromiter((i for ids in docs for i in ids), dtype=np.uint64, count=int(lengths.sum()))
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        counts = lengths - SHINGLE_SIZE + 1
+        # Positions where a full shingle fits inside its own doc
+        positions = np.repeat(starts, counts) + (np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts))
+        hashed = flat[positions] * _MIX[0]
+        for k in range(1, SHINGLE_SIZE):
+            hashed ^= flat[positions + k] * _MIX[k]
+        hashed = (hashed >> np.uint64(32)) ^ (hashed & np.uint64(0xFFFFFFFF))
+        return hashed, np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """A (len(texts), num_perm) uint32 signature matrix; rows of token-less texts are all-ones."""
+        out = np.full((len(texts), self.num_perm), _EMPTY, dtype=np.uint32)
+        batch, batch_rows, batch_size = [], [], 0
+        for row, text in enumerate(texts):
+            ids = self._token_ids(text)
+            if not ids:
+                continue
+            batch.append(ids)
+            batch_rows.append(row)
+            batch_size += len(ids)
+            if batch_size >= BATCH_SHINGLES:
+                self._fill(out, batch, batch_rows)
+                batch, batch_rows, batch_size = [], [], 0
+        if batch:
+            self._fill(out, batch, batch_rows)
+        return out
+
+    def _fill(self, out: np.ndarray, batch: List[List[int]], rows: List[int]) -> None:
+        hashes, offsets = self._shingle_hashes(batch)
+        permuted = (self._a * hashes[np.newaxis, :] + self._b) % _PRIME
+        out[rows] = np.minimum.reduceat(permuted, offsets, axis=1).T.astype(np.uint32)
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def find_near_duplicates(texts: Sequence[str], threshold: float = 0.8, num_perm: int = 64) -> np.ndarray:
+    """
+    Group near-duplicate texts in sub-quadratic time with MinHash/LSH.
+
+    Returns, for every text, the index of the earliest text in its group
+    (a text that has no near-duplicate maps to itself). Texts whose
+    estimated Jaccard similarity of word shingles reaches `threshold` are
+    grouped, transitively.
+    """
+    count = len(texts)
+    parent = list(range(count))
+    if count < 2:
+        return np.arange(count)
+    signatures = MinHasher(num_perm).signatures(texts)
+    has_tokens = signatures[:, 0] != _EMPTY
+    indices = np.arange(count)
+    bands, rows = lsh_bands(num_perm, threshold)
+
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * rows))).ravel()
+        _, first, bucket = np.unique(keys, return_index=True, return_inverse=True)
+        # Candidate pairs: every doc with the first doc of its bucket
+        representative = first[bucket.ravel()]
+        candidates = np.nonzero((representative != indices) & has_tokens)[0]
+        if not len(candidates):
+            continue
+        similarity = (signatures[candidates] == signatures[representative[candidates]]).mean(axis=1)
+        for doc, other in zip(candidates[similarity >= threshold].tolist(),
+                              representative[candidates[similarity >= threshold]].tolist()):
+            a, b = _find(parent, doc), _find(parent, other)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+    return np.fromiter((_find(parent, i) for i in range(count)), dtype=np.int64, count=count)
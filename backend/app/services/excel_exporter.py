@@ -1,233 +1,232 @@
-import pandas as pd
-import re
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Iterator, Sequence
 from datetime import datetime
+from .extraction import Extraction, extract_contacts
+
+if TYPE_CHECKING:
+    import xlsxwriter
+
+JOB_COLUMNS = [
+    'S_No', 'Company', 'Job_Role', 'Location', 'Description', 'Timestamp',
+    'Extracted_Emails', 'Extracted_Names', 'Contact_Count', 'Has_Contact_Info',
+]
+
+CONTACT_COLUMNS = [
+    'Job_Index', 'Company', 'Role', 'Email', 'Name',
+    'Source', 'Extraction_Date',
+]
+
+# Job fields the workbooks are made from
+JOB_FIELDS = ('company', 'job_title', 'location', 'job_description', 'date_of_posting')
+
+# Widest a column is auto-sized to, in characters
+MAX_COLUMN_WIDTH = 50
+
+# Rows are flushed to disk as they are written; cell strings are taken literally
+WORKBOOK_OPTIONS = {
+    'constant_memory': True,
+    'strings_to_formulas': False,
+    'strings_to_urls': False,
+}
+
+
+def _open_workbook(filename: str) -> 'xlsxwriter.Workbook':
+    """A new workbook at filename; xlsxwriter is only imported once a workbook is written."""
+    import xlsxwriter
+    return xlsxwriter.Workbook(filename, WORKBOOK_OPTIONS)
+
+
+def _field(job: Dict[str, Any], name: str, default: str) -> Any:
+    """A job's field, or `default` when it is missing or None (as in rows from a JobTable)"""
+    value = job.get(name)
+    return default if value is None else value
+
+
+class _SheetWriter:
+    """Appends rows to a worksheet, tracking column widths as it goes"""
+
+    def __init__(self, workbook: 'xlsxwriter.Workbook', name: str, columns: Sequence[str]):
+        self.worksheet = workbook.add_worksheet(name)
+        self.widths = [0] * len(columns)
+        self.rows = 0
+        self.write(columns)
+
+    def write(self, values: Sequence[Any]) -> None:
+        self.worksheet.write_row(self.rows, 0, values)
+        self.rows += 1
+        for col, value in enumerate(values):
+            length = 0 if value is None else len(str(value))
+            if length > self.widths[col]:
+                self.widths[col] = length
+
+    def finish(self) -> None:
+        for col, width in enumerate(self.widths):
+            self.worksheet.set_column(col, col, min(width + 2, MAX_COLUMN_WIDTH))
 
 
 class ExcelExporter:
     """Service for exporting job data to Excel format with enhanced features"""
-    
-    def __init__(self):
-        self.email_patterns = [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}\b',
-            r'\b[A-Za-z0-9._%+-]+\(at\)[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        ]
-        
-        self.name_patterns = [
-            r'(?:contact|reach out|email|send cv|apply to|hr|recruiter|hiring manager)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
-            r'(?:contact person|contact|coordinator|manager)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)(?:\s*-\s*(?:hr|recruiter|hiring|manager|coordinator))',
-            r'(?:for more details|contact|reach)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        ]
-    
+
+    def extract_contacts(self, text: str) -> Extraction:
+        """Extract contact emails and names from text in one pass"""
+        return extract_contacts(text)
+
     def extract_emails(self, text: str) -> List[str]:
         """Extract email addresses from text"""
-        if not text:
-            return []
-        
-        emails = set()
-        for pattern in self.email_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Clean up the email
-                clean_email = re.sub(r'\s+', '', match).replace('(at)', '@').lower()
-                if '@' in clean_email and '.' in clean_email:
-                    emails.add(clean_email)
-        
-        return list(emails)
-    
+        return extract_contacts(text).emails
+
     def extract_names(self, text: str) -> List[str]:
         """Extract contact names from text"""
-        if not text:
-            return []
-        
-        names = set()
-        for pattern in self.name_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if match.group(1):
-                    name = match.group(1).strip()
-                    # Filter out false positives
-                    if (len(name) > 2 and 
-                        'job' not in name.lower() and 
-                        'work' not in name.lower() and
-                        'position' not in name.lower() and
-                        len(name.split()) <= 4):
-                        names.add(name)
-        
-        return list(names)
-    
-    def extract_contact_info(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return extract_contacts(text).names
+
+    def job_contacts(self, job: Dict[str, Any]) -> Extraction:
+        """Extract the contacts of one job, from its description, company and job title"""
+        return self.extract_contacts(
+            f"{_field(job, 'job_description', '')} {_field(job, 'company', '')} {_field(job, 'job_title', '')}")
+
+    def contact_rows(self, idx: int, job: Dict[str, Any], contacts: Extraction,
+                     extraction_date: str) -> Iterator[Dict[str, Any]]:
+        """Contact sheet rows for one job: one per email, or one per name when there are no emails"""
+        _, emails, names = contacts
+        base = {
+            'Job_Index': idx + 1,
+            'Company': _field(job, 'company', 'Unknown'),
+            'Role': _field(job, 'job_title', 'Unknown'),
+        }
+        for email in emails:
+            yield {**base, 'Email': email, 'Name': names[0] if names else '',
+                   'Source': 'Extracted from job posting', 'Extraction_Date': extraction_date}
+
+        # If names but no emails
+        if not emails:
+            for name in names:
+                yield {**base, 'Email': '', 'Name': name,
+                       'Source': 'Extracted from job posting', 'Extraction_Date': extraction_date}
+
+    def extract_contact_info(self, jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract contact information from job data"""
+        extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         contact_info = []
-        
         for idx, job in enumerate(jobs):
-            text = f"{job.get('description', '')} {job.get('company', '')} {job.get('role', '')}"
-            emails = self.extract_emails(text)
-            names = self.extract_names(text)
-            
-            if emails or names:
-                for email in emails:
-                    contact_info.append({
-                        'Job_Index': idx + 1,
-                        'Company': job.get('company', 'Unknown'),
-                        'Role': job.get('role', 'Unknown'),
-                        'Email': email,
-                        'Name': names[0] if names else '',
-                        'Source': 'Extracted from job posting',
-                        'Extraction_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                
-                # If names but no emails
-                if not emails and names:
-                    for name in names:
-                        contact_info.append({
-                            'Job_Index': idx + 1,
-                            'Company': job.get('company', 'Unknown'),
-                            'Role': job.get('role', 'Unknown'),
-                            'Email': '',
-                            'Name': name,
-                            'Source': 'Extracted from job posting',
-                            'Extraction_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-        
+            contact_info.extend(self.contact_rows(idx, job, self.job_contacts(job), extraction_date))
         return contact_info
-    
-    def format_jobs_for_excel(self, jobs: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Format job data for Excel export with enhanced information"""
-        formatted_data = []
-        
-        for idx, job in enumerate(jobs):
-            description = job.get('description', '')
-            emails = self.extract_emails(description)
-            names = self.extract_names(description)
-            
-            formatted_data.append({
-                'S_No': idx + 1,
-                'Company': job.get('company', ''),
-                'Job_Role': job.get('role', ''),
-                'Location': job.get('location', ''),
-                'Description': description,
-                'Timestamp': job.get('timestamp', ''),
-                'Extracted_Emails': ', '.join(emails),
-                'Extracted_Names': ', '.join(names),
-                'Contact_Count': len(emails) + len(names),
-                'Has_Contact_Info': 'Yes' if emails or names else 'No'
-            })
-        
-        return pd.DataFrame(formatted_data)
-    
-    def create_excel_file(self, jobs: List[Dict[str, Any]], filename: str) -> str:
-        """Create Excel file with job data and return file path"""
-        
-        # Create job data sheet
-        job_df = self.format_jobs_for_excel(jobs)
-        
-        # Create contact info sheet
-        contact_info = self.extract_contact_info(jobs)
-        contact_df = pd.DataFrame(contact_info)
-        
-        # Create summary sheet
-        summary_data = {
-            'Metric': [
-                'Total Jobs',
-                'Jobs with Contact Info',
-                'Total Emails Found',
-                'Total Names Found',
-                'Unique Companies',
-                'Export Date'
-            ],
-            'Value': [
-                len(jobs),
-                len([job for job in jobs if self.extract_emails(job.get('description', '')) or self.extract_names(job.get('description', ''))]),
-                len(set([email for job in jobs for email in self.extract_emails(job.get('description', ''))])),
-                len(set([name for job in jobs for name in self.extract_names(job.get('description', ''))])),
-                len(set([job.get('company', 'Unknown') for job in jobs if job.get('company')])),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        
-        # Write to Excel with multiple sheets
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            job_df.to_excel(writer, sheet_name='Job_Data', index=False)
-            
-            if not contact_df.empty:
-                contact_df.to_excel(writer, sheet_name='Contact_Info', index=False)
-            
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Auto-adjust column widths
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)  # Cap at 50 characters
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-        
+
+    def format_job_row(self, idx: int, job: Dict[str, Any], contacts: Extraction) -> List[Any]:
+        """Job sheet row for one job, in JOB_COLUMNS order"""
+        _, emails, names = contacts
+        return [
+            idx + 1,
+            _field(job, 'company', ''),
+            _field(job, 'job_title', ''),
+            _field(job, 'location', ''),
+            _field(job, 'job_description', ''),
+            _field(job, 'date_of_posting', ''),
+            ', '.join(emails),
+            ', '.join(names),
+            len(emails) + len(names),
+            'Yes' if emails or names else 'No',
+        ]
+
+    def create_excel_file(self, jobs: Iterable[Dict[str, Any]], filename: str) -> str:
+        """
+        Create Excel file with job data, contact info and summary sheets and
+        return its path. Jobs are read once, contacts are extracted once per
+        job, and rows are streamed to disk, so memory stays flat however many
+        jobs there are.
+        """
+        extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        total_jobs = 0
+        jobs_with_contacts = 0
+        emails_found = set()
+        names_found = set()
+        companies = set()
+
+        workbook = _open_workbook(filename)
+        try:
+            job_sheet = _SheetWriter(workbook, 'Job_Data', JOB_COLUMNS)
+            contact_sheet = None
+
+            for idx, job in enumerate(jobs):
+                contacts = self.job_contacts(job)
+                job_sheet.write(self.format_job_row(idx, job, contacts))
+
+                for contact in self.contact_rows(idx, job, contacts, extraction_date):
+                    if contact_sheet is None:
+                        contact_sheet = _SheetWriter(workbook, 'Contact_Info', CONTACT_COLUMNS)
+                    contact_sheet.write([contact[column] for column in CONTACT_COLUMNS])
+
+                total_jobs += 1
+                if contacts.emails or contacts.names:
+                    jobs_with_contacts += 1
+                emails_found.update(contacts.emails)
+                names_found.update(contacts.names)
+                if job.get('company'):
+                    companies.add(job['company'])
+
+            summary_sheet = _SheetWriter(workbook, 'Summary', ['Metric', 'Value'])
+            for row in [
+                ('Total Jobs', total_jobs),
+                ('Jobs with Contact Info', jobs_with_contacts),
+                ('Total Emails Found', len(emails_found)),
+                ('Total Names Found', len(names_found)),
+                ('Unique Companies', len(companies)),
+                ('Export Date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ]:
+                summary_sheet.write(row)
+
+            for sheet in (job_sheet, contact_sheet, summary_sheet):
+                if sheet is not None:
+                    sheet.finish()
+        finally:
+            workbook.close()
+
+        return filename
+
+    def create_contacts_only_excel(self, jobs: Iterable[Dict[str, Any]], filename: str) -> str:
+        """Create Excel file with only contact information, streamed like create_excel_file"""
+        extraction_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        total_contacts = 0
+        with_email = 0
+        name_only = 0
+        unique_emails = set()
+        unique_names = set()
+
+        workbook = _open_workbook(filename)
+        try:
+            contact_sheet = None
+            for idx, job in enumerate(jobs):
+                for contact in self.contact_rows(idx, job, self.job_contacts(job), extraction_date):
+                    if contact_sheet is None:
+                        contact_sheet = _SheetWriter(workbook, 'Contacts', CONTACT_COLUMNS)
+                    contact_sheet.write([contact[column] for column in CONTACT_COLUMNS])
+
+                    total_contacts += 1
+                    if contact['Email']:
+                        with_email += 1
+                        unique_emails.add(contact['Email'])
+                    elif contact['Name']:
+                        name_only += 1
+                    if contact['Name']:
+                        unique_names.add(contact['Name'])
+
+            if contact_sheet is None:
+                # Empty file with headers
+                workbook.add_worksheet('Sheet1').write_row(0, 0, CONTACT_COLUMNS)
+                return filename
+
+            summary_sheet = _SheetWriter(workbook, 'Summary', ['Metric', 'Value'])
+            for row in [
+                ('Total Contacts Found', total_contacts),
+                ('Contacts with Email', with_email),
+                ('Contacts with Name Only', name_only),
+                ('Unique Emails', len(unique_emails)),
+                ('Unique Names', len(unique_names)),
+                ('Export Date', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+            ]:
+                summary_sheet.write(row)
+
+            contact_sheet.finish()
+            summary_sheet.finish()
+        finally:
+            workbook.close()
+
         return filename
-    
-    def create_contacts_only_excel(self, jobs: List[Dict[str, Any]], filename: str) -> str:
-        """Create Excel file with only contact information"""
-        contact_info = self.extract_contact_info(jobs)
-        
-        if not contact_info:
-            # Create empty file with headers
-            empty_df = pd.DataFrame(columns=[
-                'Job_Index', 'Company', 'Role', 'Email', 'Name', 
-                'Source', 'Extraction_Date'
-            ])
-            empty_df.to_excel(filename, index=False)
-            return filename
-        
-        contact_df = pd.DataFrame(contact_info)
-        
-        # Create summary for contacts
-        summary_data = {
-            'Metric': [
-                'Total Contacts Found',
-                'Contacts with Email',
-                'Contacts with Name Only',
-                'Unique Emails',
-                'Unique Names',
-                'Export Date'
-            ],
-            'Value': [
-                len(contact_info),
-                len([c for c in contact_info if c['Email']]),
-                len([c for c in contact_info if c['Name'] and not c['Email']]),
-                len(set([c['Email'] for c in contact_info if c['Email']])),
-                len(set([c['Name'] for c in contact_info if c['Name']])),
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            ]
-        }
-        summary_df = pd.DataFrame(summary_data)
-        
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            contact_df.to_excel(writer, sheet_name='Contacts', index=False)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-            # Auto-adjust column widths
-            for sheet_name in writer.sheets:
-                worksheet = writer.sheets[sheet_name]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        return filename
\ No newline at end of file
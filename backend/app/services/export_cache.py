@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# Partial files older than this are left over from a crashed build and may be evicted
+STALE_PART_SECONDS = 3600
+
+class ExportCache:
+    """
+    Generated export files kept on disk under `directory`, named by a key
+    that identifies their content. Once the files take more than
+    `max_bytes` in all, the least recently served are deleted. Files are
+    written under a temporary name and renamed into place, so server
+    workers sharing the directory never serve a partial file.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # One lock per key being built, so concurrent requests build it once
+        self._building: Dict[str, threading.Lock] = {}
+
+    def get_or_create(self, key: str, build: Callable[[str], None]) -> str:
+        """
+        Path of the file for `key`. When it is not cached, build(path) is
+        called to write it and older files are evicted to stay in budget.
+        """
+        path = os.path.join(self.directory, key)
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+        try:
+            with building:
+                try:
+                    # The modification time records when the file was last served
+                    os.utime(path)
+                    with self._lock:
+                        self.hits += 1
+                    return path
+                except FileNotFoundError:
+                    pass
+                with self._lock:
+                    self.misses += 1
+                os.makedirs(self.directory, exist_ok=True)
+                fd, partial = tempfile.mkstemp(dir=self.directory, prefix=f'{key}.', suffix='.part')
+                os.close(fd)
+                try:
+                    build(partial)
+                    os.replace(partial, path)
+                except BaseException:
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                    raise
+        finally:
+            with self._lock:
+                self._building.pop(key, None)
+        self._evict(keep=path)
+        return path
+
+    def _entries(self) -> Iterator[Tuple[float, int, str]]:
+        """(modification time, size, path) of every file in the cache directory."""
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield stat.st_mtime, stat.st_size, entry.path
+        except FileNotFoundError:
+            return
+
+    def _evict(self, keep: str) -> None:
+        """Delete the least recently served files, except `keep`, until the rest fit in max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        now = time.time()
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep or (path.endswith('.part') and now - mtime < STALE_PART_SECONDS):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another worker evicted it first
+                pass
+            else:
+                with self._lock:
+                    self.evictions += 1
+            total -= size
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        entries = list(self._entries())
+        return {
+            'size': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else None,
+        }
@@ -1,12 +1,119 @@
-import pandas as pd
+import csv
+import orjson
 from io import StringIO
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from ..models.job_post import INTEGER_FIELDS
+from ..models.job_table import JobTable
+
+# Job posts as a JobTable or as dicts of JobPost fields
+JobPosts = Union[JobTable, Iterable[Dict[str, Any]]]
+
+# Rows rendered per chunk handed to the response
+CHUNK_ROWS = 500
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 10000
+
+class ExportUnavailable(RuntimeError):
+    """Raised when an export format needs an optional dependency that is not installed."""
+
+def _iter_csv_rows(header: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int) -> Iterator[str]:
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(header)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def iter_csv(job_posts: JobPosts, fieldnames: Optional[Sequence[str]] = None,
+             chunk_rows: int = CHUNK_ROWS) -> Iterator[str]:
+    """
+    Render job posts as CSV, yielding a chunk every `chunk_rows` rows so
+    rows are written as they are produced. Columns default to the keys of
+    the first row (all columns, for a JobTable).
+    """
+    if isinstance(job_posts, JobTable):
+        fieldnames = list(fieldnames or job_posts.columns)
+        yield from _iter_csv_rows(fieldnames, zip(*(job_posts.column(name) for name in fieldnames)), chunk_rows)
+        return
+
+    buffer = StringIO()
+    writer = None
+    pending = 0
+    for job in job_posts:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(fieldnames or job), lineterminator='\n',
+                                    extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow(job)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if writer is None and fieldnames:
+        csv.writer(buffer, lineterminator='\n').writerow(fieldnames)
+    if buffer.tell():
+        yield buffer.getvalue()
 
 def export_to_csv(job_posts: List[Dict[str, Any]]) -> str:
     """
     Export list of job posts to CSV string.
     """
-    df = pd.DataFrame(job_posts)
-    csv_buffer = StringIO()
-    df.to_csv(csv_buffer, index=False)
-    return csv_buffer.getvalue()
\ No newline at end of file
+    return ''.join(iter_csv(job_posts))
+
+def iter_ndjson(job_posts: JobPosts, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Render job posts as newline-delimited JSON (UTF-8), one object per line, in chunks."""
+    if isinstance(job_posts, JobTable):
+        job_posts = job_posts.dicts()
+    lines = []
+    for job in job_posts:
+        lines.append(orjson.dumps(job))
+        if len(lines) >= chunk_rows:
+            lines.append(b'')
+            yield b'\n'.join(lines)
+            lines = []
+    if lines:
+        lines.append(b'')
+        yield b'\n'.join(lines)
+
+def write_parquet(job_posts: JobPosts, path: str, fieldnames: Sequence[str],
+                  batch_rows: int = PARQUET_BATCH_ROWS) -> str:
+    """
+    Write job posts to a Parquet file one row group at a time, so at most
+    `batch_rows` rows are held in memory. Needs pyarrow.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        (name, pa.int64() if name in INTEGER_FIELDS else pa.string()) for name in fieldnames
+    ])
+    with pq.ParquetWriter(path, schema) as writer:
+        if isinstance(job_posts, JobTable):
+            for start in range(0, len(job_posts), batch_rows):
+                columns = {name: job_posts.column(name)[start:start + batch_rows] for name in fieldnames}
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            return path
+
+        batch = []
+        for job in job_posts:
+            batch.append(job)
+            if len(batch) >= batch_rows:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    return path
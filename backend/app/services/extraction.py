@@ -0,0 +1,120 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Job fields (first occurrence wins)
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'\+?\d[\d\s\-\(\)]{8,}\d')
+LINK_RE = re.compile(r'https?://[^\s]+')
+TITLE_RE = re.compile(r'(?i)job\s*title\s*[:\-]?\s*([^\n\r]+)')
+COMPANY_RE = re.compile(r'(?i)company\s*[:\-]?\s*([^\n\r]+)')
+LOCATION_RE = re.compile(r'(?i)location\s*[:\-]?\s*([^\n\r]+)')
+DATE_RE = re.compile(r'\b\d{4}-\d{2}-\d{2}\b')
+
+# Contact details (every occurrence)
+CONTACT_EMAIL_RES = [
+    re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE),
+    re.compile(r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}\b', re.IGNORECASE),
+    re.compile(r'\b[A-Za-z0-9._%+-]+\(at\)[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', re.IGNORECASE),
+]
+CONTACT_NAME_RES = [
+    re.compile(r'(?:contact|reach out|email|send cv|apply to|hr|recruiter|hiring manager)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', re.IGNORECASE),
+    re.compile(r'(?:contact person|contact|coordinator|manager)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE),
+    re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)(?:\s*-\s*(?:hr|recruiter|hiring|manager|coordinator))', re.IGNORECASE),
+    re.compile(r'(?:for more details|contact|reach)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE),
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+_ROLE_SUFFIX_RE = re.compile(r'-\s*(?:hr|recruiter|hiring|manager|coordinator)', re.IGNORECASE)
+
+# Keywords each name pattern cannot match without, so messages lacking
+# them skip that (expensive) scan entirely
+_NAME_TRIGGERS = [
+    ('contact', 'reach out', 'email', 'send cv', 'apply to', 'hr', 'recruiter', 'hiring manager'),
+    ('contact', 'coordinator', 'manager'),
+    None,
+    ('for more details', 'contact', 'reach'),
+]
+_NAME_STOPWORDS = ('job', 'work', 'position')
+
+class Extraction(NamedTuple):
+    fields: Dict[str, Optional[str]]
+    emails: List[str]
+    names: List[str]
+
+def _first(pattern: re.Pattern, text: str, group: int = 0) -> Optional[str]:
+    match = pattern.search(text)
+    if not match:
+        return None
+    return match.group(group).strip() if group else match.group(0)
+
+def _extract_fields(text: str, folded: str) -> Dict[str, Optional[str]]:
+    return {
+        'email': _first(EMAIL_RE, text) if '@' in text else None,
+        'phone': _first(PHONE_RE, text) if len(text) >= 10 else None,
+        'link': _first(LINK_RE, text) if 'http' in text else None,
+        'job_title': _first(TITLE_RE, text, 1) if 'title' in folded else None,
+        'company': _first(COMPANY_RE, text, 1) if 'company' in folded else None,
+        'location': _first(LOCATION_RE, text, 1) if 'location' in folded else None,
+        'date_of_posting': _first(DATE_RE, text) if '-' in text else None,
+    }
+
+def _extract_emails(text: str, folded: str) -> List[str]:
+    has_at, has_word_at = '@' in text, '(at)' in folded
+    if not has_at and not has_word_at:
+        return []
+    emails = {}
+    for pattern, enabled in zip(CONTACT_EMAIL_RES, (has_at, has_at, has_word_at)):
+        if not enabled:
+            continue
+        for match in pattern.findall(text):
+            email = _WHITESPACE_RE.sub('', match).replace('(at)', '@').lower()
+            if '@' in email and '.' in email:
+                emails[email] = None
+    return list(emails)
+
+def _extract_names(text: str, folded: str) -> List[str]:
+    names = {}
+    for pattern, triggers in zip(CONTACT_NAME_RES, _NAME_TRIGGERS):
+        if triggers is None:
+            if '-' not in text or not _ROLE_SUFFIX_RE.search(text):
+                continue
+        elif not any(trigger in folded for trigger in triggers):
+            continue
+        for match in pattern.finditer(text):
+            if not match.group(1):
+                continue
+            name = match.group(1).strip()
+            lowered = name.lower()
+            if (len(name) > 2 and
+                    not any(word in lowered for word in _NAME_STOPWORDS) and
+                    len(name.split()) <= 4):
+                names[name] = None
+    return list(names)
+
+def extract_fields(text: str) -> Dict[str, Optional[str]]:
+    """
+    Find the first email, phone, link, job title, company, location and
+    posting date in a message. Phone numbers are returned as matched.
+    """
+    return _extract_fields(text, text.casefold())
+
+def extract_contacts(text: str) -> Extraction:
+    """Find every contact email and contact name in a text."""
+    if not text:
+        return Extraction({}, [], [])
+    folded = text.casefold()
+    return Extraction({}, _extract_emails(text, folded), _extract_names(text, folded))
+
+def extract_all(text: str) -> Extraction:
+    """
+    Extract job fields and contact details from a message in one call.
+
+    The text is case-folded once and cheap substring checks decide which
+    precompiled patterns can possibly match, so most patterns never run
+    on a typical message.
+    """
+    folded = text.casefold()
+    return Extraction(
+        _extract_fields(text, folded),
+        _extract_emails(text, folded) if text else [],
+        _extract_names(text, folded) if text else [],
+    )
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from .lru_cache import LRUCache
+
+# Bump when extraction or cleaning changes so stale on-disk entries are ignored
+CACHE_VERSION = b'3'
+
+# Pending disk writes buffered before they are flushed in one transaction
+FLUSH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extraction_cache (
+    key BLOB PRIMARY KEY,
+    value TEXT NOT NULL
+)
+"""
+
+def message_key(text: str) -> bytes:
+    """Content address of a message: a hash of its text and the cache version."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16, key=CACHE_VERSION).digest()
+
+class ExtractionCache:
+    """
+    Remembers the cleaned job fields of every message by text hash, so a
+    message seen in an earlier upload skips extraction and validation. The
+    description is left out of the stored fields: it is the message text,
+    which the caller already has.
+
+    Entries live in a bounded in-memory LRU. With a `path`, they are also
+    written to a SQLite file that survives restarts and is shared by all
+    processes pointing at it; the file keeps at most `disk_size` entries.
+    """
+
+    def __init__(self, maxsize: int, path: str = '', disk_size: int = 0):
+        self.memory = LRUCache(maxsize)
+        self.path = path
+        self.disk_size = disk_size
+        self.disk_hits = 0
+        self._pending: List[Tuple[bytes, str]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connection() as conn:
+                conn.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        key = message_key(text)
+        value = self.memory.get(key)
+        if value is not None or not self.path:
+            return value
+        row = self._connection().execute(
+            "SELECT value FROM extraction_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        self.memory.put(key, value)
+        with self._lock:
+            self.disk_hits += 1
+        return value
+
+    def put(self, text: str, value: Dict[str, Any]) -> None:
+        key = message_key(text)
+        self.memory.put(key, value)
+        if not self.path:
+            return
+        with self._lock:
+            self._pending.append((key, json.dumps(value)))
+            full = len(self._pending) >= FLUSH_SIZE
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered entries to the backing file and trim it to disk_size."""
+        if not self.path:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO extraction_cache (key, value) VALUES (?, ?)", pending)
+            if self.disk_size:
+                # Oldest writes go first
+                conn.execute(
+                    "DELETE FROM extraction_cache WHERE rowid <= "
+                    "(SELECT MAX(rowid) FROM extraction_cache) - ?", (self.disk_size,)
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        # Disk hits were memory misses; report them as hits overall
+        stats['memory_hits'] = stats['hits']
+        stats['disk_hits'] = self.disk_hits
+        stats['hits'] += self.disk_hits
+        stats['misses'] -= self.disk_hits
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else None
+        stats['backing_file'] = self.path or None
+        return stats
@@ -0,0 +1,171 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+# Upper bounds (seconds) of the stage latency histogram buckets; per-message
+# stages land in the low buckets, whole-upload stages such as dedup or an
+# export in the high ones
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0)
+
+PREFIX = 'tgjobs'
+
+T = TypeVar('T')
+
+class StageTimings:
+    """
+    Latency histograms per pipeline stage. Instances are filled without
+    locking on the hot path (one per page or request) and merged into the
+    process-wide registry in one step; they pickle, so pool workers send
+    theirs back with their results.
+    """
+
+    def __init__(self):
+        # stage -> [count per bucket (last is +Inf), observations, total seconds]
+        self.stages: Dict[str, List[Any]] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        entry = self.stages.get(stage)
+        if entry is None:
+            entry = self.stages[stage] = [[0] * (len(BUCKETS) + 1), 0, 0.0]
+        entry[0][bisect_left(BUCKETS, seconds)] += 1
+        entry[1] += 1
+        entry[2] += seconds
+
+    def merge(self, other: 'StageTimings') -> None:
+        for stage, (buckets, count, total) in other.stages.items():
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [list(buckets), count, total]
+                continue
+            entry[0] = [a + b for a, b in zip(entry[0], buckets)]
+            entry[1] += count
+            entry[2] += total
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds spent per stage."""
+        return {stage: entry[2] for stage, entry in self.stages.items()}
+
+_lock = threading.Lock()
+_stage_seconds = StageTimings()
+_counters: Dict[str, float] = defaultdict(float)
+_gauges: Dict[str, float] = {}
+
+# Stage breakdown of the current request, when it asked to be profiled
+_profile: contextvars.ContextVar[Optional[StageTimings]] = contextvars.ContextVar('profile', default=None)
+
+def record(timings: StageTimings) -> None:
+    """Add locally collected stage timings to the process-wide histograms and the request profile."""
+    with _lock:
+        _stage_seconds.merge(timings)
+    profile = _profile.get()
+    if profile is not None:
+        profile.merge(timings)
+
+@contextmanager
+def stage(name: str, timings: Optional[StageTimings] = None) -> Iterator[None]:
+    """Time a block as one observation of stage `name`, also adding it to `timings` if given."""
+    local = StageTimings()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        local.observe(name, time.perf_counter() - start)
+        if timings is not None:
+            timings.merge(local)
+        record(local)
+
+def timed_iter(name: str, items: Iterable[T]) -> Iterator[T]:
+    """
+    Pass `items` through, timing the work of producing them (not the time
+    the consumer spends in between) as one observation of stage `name`.
+    """
+    elapsed = 0.0
+    iterator = iter(items)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter() - start
+                break
+            elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        local = StageTimings()
+        local.observe(name, elapsed)
+        record(local)
+
+def inc(name: str, value: float = 1) -> None:
+    """Increase the counter `name`."""
+    with _lock:
+        _counters[name] += value
+
+def set_gauge(name: str, value: float) -> None:
+    with _lock:
+        _gauges[name] = value
+
+def start_profile() -> StageTimings:
+    """Collect a stage breakdown of the current request."""
+    profile = StageTimings()
+    _profile.set(profile)
+    return profile
+
+def add_to_profile(totals: Dict[str, float]) -> None:
+    """Report stage totals measured elsewhere (such as by a background task) in the request profile."""
+    profile = _profile.get()
+    if profile is not None:
+        for name, seconds in totals.items():
+            profile.observe(name, seconds)
+
+def server_timing(profile: StageTimings) -> str:
+    """A profile as a Server-Timing header value, in milliseconds per stage."""
+    return ', '.join(f'{name};dur={seconds * 1000:.1f}' for name, seconds in profile.totals().items())
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render(caches: Dict[str, Dict[str, Any]]) -> str:
+    """
+    All metrics in the Prometheus text exposition format. `caches` maps a
+    cache name to its stats (hits, misses, hit_rate, size, bytes) at scrape time.
+    """
+    with _lock:
+        stages = {name: (list(buckets), count, total)
+                  for name, (buckets, count, total) in _stage_seconds.stages.items()}
+        counters = dict(_counters)
+        gauges = dict(_gauges)
+
+    lines = [f'# HELP {PREFIX}_stage_seconds Time spent per pipeline stage',
+             f'# TYPE {PREFIX}_stage_seconds histogram']
+    for name, (buckets, count, total) in sorted(stages.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS + (float('inf'),), buckets):
+            cumulative += bucket_count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{_escape(name)}",le="{le}"}} {cumulative}')
+        lines.append(f'{PREFIX}_stage_seconds_count{{stage="{_escape(name)}"}} {count}')
+        lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{_escape(name)}"}} {_number(total)}')
+
+    for name, value in sorted(counters.items()):
+        lines.append(f'# TYPE {PREFIX}_{name}_total counter')
+        lines.append(f'{PREFIX}_{name}_total {_number(value)}')
+    for name, value in sorted(gauges.items()):
+        lines.append(f'# TYPE {PREFIX}_{name} gauge')
+        lines.append(f'{PREFIX}_{name} {_number(value)}')
+
+    for metric, kind in (('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'),
+                         ('size', 'gauge'), ('bytes', 'gauge'), ('hit_rate', 'gauge')):
+        name = f'{PREFIX}_cache_{metric}' + ('_total' if kind == 'counter' else '')
+        lines.append(f'# TYPE {name} {kind}')
+        for cache, stats in sorted(caches.items()):
+            if stats.get(metric) is not None:
+                lines.append(f'{name}{{cache="{_escape(cache)}"}} {_number(stats[metric])}')
+    return '\n'.join(lines) + '\n'
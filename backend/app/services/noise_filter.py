@@ -0,0 +1,90 @@
+import re
+from .extraction import EMAIL_RE, LINK_RE, TITLE_RE, COMPANY_RE
+
+# Server-side port of isValidJobPosting in client/src/utils/dataFilter.js,
+# run on the raw message text so noise never reaches extraction. The
+# client's checks on extracted fields become checks with the same
+# extraction patterns.
+
+# Whole-message placeholders left for media that was not exported
+NOISE_MESSAGES = frozenset(['photo', 'video', 'document'])
+
+# Messages starting with these (case-insensitive) are announcements or chatter
+NOISE_PREFIXES = (
+    'not included, change data exporting settings',
+    'in reply to',
+    'read all steps',
+    'hello everyone',
+    'warning ⚠️',
+    "don't waste your precious time",
+    'most students are telling us',
+    'if you have not received any call',
+    'we can not do anything',
+    'no useless msg',
+    'send msg format',
+    'everyone do it asap',
+)
+
+# Date separators, bare timestamps and tilde rules
+NOISE_START_RE = re.compile(
+    r'[0-9]+\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)'
+    r'|\d+:\d+$|~+$',
+    re.IGNORECASE,
+)
+
+# Group service events anywhere in the message
+NOISE_EVENT_RE = re.compile(
+    r'joined group by link from Group|left the group|removed .+ from|invited .+|converted a basic group'
+    r'|changed group|pinned a message|unpinned a message|changed the group photo|deleted a message'
+    r'|forwarded .+ messages',
+    re.IGNORECASE,
+)
+
+# Words that indicate a job posting; each one present counts once
+JOB_KEYWORDS = (
+    'company', 'role', 'position', 'hiring', 'job', 'intern', 'developer', 'engineer', 'analyst',
+    'salary', 'ctc', 'stipend', 'location', 'apply', 'resume', 'experience', 'fresher', 'batch',
+)
+
+_INDICATOR_EMAIL_RE = re.compile(r'@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_INDICATOR_URL_RE = re.compile(r'https?://\S', re.IGNORECASE)
+
+def _field(pattern: re.Pattern, text: str) -> str:
+    match = pattern.search(text)
+    return match.group(1).strip() if match else ''
+
+def is_noise(text: str) -> bool:
+    """True for join/leave notices, pins, media placeholders, date lines and similar noise."""
+    lowered = text.lower()
+    return (
+        lowered in NOISE_MESSAGES
+        or lowered.startswith(NOISE_PREFIXES)
+        or NOISE_START_RE.match(text) is not None
+        or NOISE_EVENT_RE.search(text) is not None
+    )
+
+def is_job_posting(text: str) -> bool:
+    """
+    Classify a message from its raw text, like the client's
+    isValidJobPosting: an email, company, job title or link keeps it;
+    otherwise noise is dropped and it needs enough job indicators.
+    """
+    if '@' in text and EMAIL_RE.search(text):
+        return True
+    lowered = text.lower()
+    if 'company' in lowered and len(_field(COMPANY_RE, text)) > 2:
+        return True
+    if 'title' in lowered and len(_field(TITLE_RE, text)) > 3:
+        return True
+    if 'http' in text and LINK_RE.search(text):
+        return True
+
+    if is_noise(text):
+        return False
+
+    indicators = sum(1 for word in JOB_KEYWORDS if word in lowered)
+    if '@' in text and _INDICATOR_EMAIL_RE.search(text):
+        indicators += 1
+    if 'http' in lowered and _INDICATOR_URL_RE.search(text):
+        indicators += 1
+    return indicators >= 2 or (len(text) > 50 and indicators >= 1)
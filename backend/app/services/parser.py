@@ -1,12 +1,172 @@
-from bs4 import BeautifulSoup
-from typing import List
+import os
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+# Bytes fed to the incremental parser per read
+CHUNK_SIZE = 64 * 1024
+
+# A whole document, a file object, an iterable of chunks, or the path of a file on disk
+HtmlSource = Union[str, bytes, os.PathLike, Iterable[Union[str, bytes]]]
+
+_MESSAGE_MARKER = b'class="message'
+
+# Where a message element starts; text cannot contain it, since "<" is escaped there
+_MESSAGE_START = b'<div ' + _MESSAGE_MARKER
+
+# Input fed to one incremental parser before a fresh one takes over
+PARSER_RESTART_BYTES = 4 * 1024 * 1024
 
 def parse_html(html_content: str) -> List[str]:
     """
     Parse Telegram HTML export and extract message texts.
     Assumes messages are in <div class="message"> elements.
     """
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'lxml')
     messages = soup.find_all('div', class_='message')
     texts = [msg.get_text(strip=True) for msg in messages if msg.get_text(strip=True)]
-    return texts
\ No newline at end of file
+    return texts
+
+def estimate_message_count(html_content: Union[str, bytes, os.PathLike]) -> int:
+    """
+    Cheaply count message blocks in an export page without parsing it.
+    Service messages are included, so this is an upper bound. A page on
+    disk is scanned in chunks.
+    """
+    if isinstance(html_content, str):
+        return html_content.count(_MESSAGE_MARKER.decode())
+    if isinstance(html_content, bytes):
+        return html_content.count(_MESSAGE_MARKER)
+    count = 0
+    tail = b''
+    with open(html_content, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return count
+            # Keep the end of the previous chunk so a marker split across chunks is counted once
+            window = tail + chunk
+            count += window.count(_MESSAGE_MARKER)
+            tail = window[-(len(_MESSAGE_MARKER) - 1):]
+
+def _iter_chunks(source: HtmlSource, chunk_size: int = CHUNK_SIZE) -> Iterator[Union[str, bytes]]:
+    """
+    Yield the export in pieces, whether it is a whole document,
+    a binary/text file object, a path or an iterable of chunks.
+    """
+    if isinstance(source, (str, bytes)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif isinstance(source, os.PathLike):
+        with open(source, 'rb') as f:
+            yield from _iter_chunks(f, chunk_size)
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+class Message(NamedTuple):
+    """A message from an export, with its Telegram ID and timestamp when present."""
+    id: Optional[int]
+    timestamp: Optional[str]
+    text: str
+    chat: Optional[str] = None
+
+def _classes(element) -> List[str]:
+    return (element.get('class') or '').split()
+
+def _is_message(element) -> bool:
+    return 'message' in _classes(element)
+
+def _message_id(element) -> Optional[int]:
+    """Telegram numbers messages id="messageNNNN" (service messages may be negative)."""
+    raw = element.get('id') or ''
+    if raw.startswith('message'):
+        try:
+            return int(raw[len('message'):])
+        except ValueError:
+            return None
+    return None
+
+def _message_timestamp(element) -> Optional[str]:
+    """The full date is kept in the title of the message's date element."""
+    for div in element.iter('div'):
+        if 'date' in _classes(div) and div.get('title'):
+            return div.get('title')
+    return None
+
+def iter_message_records(source: HtmlSource, chunk_size: int = CHUNK_SIZE) -> Iterator[Message]:
+    """
+    Stream messages out of a Telegram HTML export.
+
+    Produces the same texts as parse_html, but feeds the document to an
+    incremental lxml parser and frees every message element once it has
+    been emitted. libxml2's HTML push parser keeps the input it was fed,
+    so the parser is replaced by a fresh one, at the start of a message,
+    every PARSER_RESTART_BYTES; memory then stays bounded by that rather
+    than by the size of the export. Each record also carries the message
+    ID, timestamp and the chat title from the page header.
+    """
+    from lxml import etree
+
+    def new_parser():
+        return etree.HTMLPullParser(events=('start', 'end'), tag='div', encoding='utf-8')
+
+    parser = new_parser()
+    fed = 0
+    # Messages nested in the one currently open, in document order
+    pending = []
+    chat = None
+
+    def drain() -> Iterator[Message]:
+        nonlocal chat
+        for event, element in parser.read_events():
+            if not _is_message(element):
+                if event == 'end' and chat is None and 'page_header' in _classes(element):
+                    chat = ' '.join(part.strip() for part in element.itertext() if part.strip()) or None
+                continue
+            if event == 'start':
+                pending.append(element)
+                continue
+            if element is not pending[0]:
+                continue
+            for message in pending:
+                text = ''.join(part.strip() for part in message.itertext())
+                if text:
+                    yield Message(_message_id(message), _message_timestamp(message), text, chat)
+            pending.clear()
+            element.clear()
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+
+    # Input from the last message start on, held back until the next one arrives
+    held = b''
+    for chunk in _iter_chunks(source, chunk_size):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        held += chunk
+        start = held.rfind(_MESSAGE_START)
+        # Without a message start, keep back only what may begin one split across chunks
+        cut = start if start > 0 else len(held) - len(_MESSAGE_START) + 1
+        if cut <= 0:
+            continue
+        parser.feed(held[:cut])
+        fed += cut
+        held = held[cut:]
+        yield from drain()
+        if start > 0 and fed >= PARSER_RESTART_BYTES and not pending:
+            # No message is open, so the next parser can start from this one's beginning
+            parser.close()
+            parser, fed = new_parser(), 0
+    parser.feed(held)
+    parser.close()
+    yield from drain()
+
+def iter_messages(source: HtmlSource, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Stream message texts out of a Telegram HTML export (see iter_message_records)."""
+    for message in iter_message_records(source, chunk_size):
+        yield message.text
@@ -0,0 +1,192 @@
+import re
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.job_post import SEARCH_FIELDS
+from ..models.job_table import JobRow, JobTable
+
+_TOKEN_RE = re.compile(r'\w+')
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens, as indexed and as matched by keyword search."""
+    return _TOKEN_RE.findall(text.lower())
+
+def _normalize(value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    value = value.strip().lower()
+    return value or None
+
+def _date_number(value: Optional[str]) -> int:
+    """YYYY-MM-DD as the integer YYYYMMDD, or 0 when missing or malformed."""
+    try:
+        return int(value.replace('-', '')) if value and len(value) == 10 else 0
+    except ValueError:
+        return 0
+
+def _grouped_postings(keys: np.ndarray, rows: np.ndarray, key_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rows ordered by key (keeping row order within a key) and the offset of
+    each key's run, so the rows of key k are postings[offsets[k]:offsets[k + 1]].
+    """
+    order = np.argsort(keys, kind='stable')
+    offsets = np.zeros(key_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=key_count), out=offsets[1:])
+    return rows[order], offsets
+
+def _intersect(rows: np.ndarray, other: np.ndarray, size: int) -> np.ndarray:
+    """The rows (sorted) that are also in `other` (sorted), out of `size` rows in all."""
+    if len(rows) * 32 < len(other):
+        # Few rows against a long list: binary-search each one
+        positions = np.minimum(np.searchsorted(other, rows), len(other) - 1)
+        return rows[other[positions] == rows]
+    present = np.zeros(size, dtype=bool)
+    present[other] = True
+    return rows[present[rows]]
+
+class _FieldIndex:
+    """Value ID per row (0 when missing) plus the rows holding each value."""
+
+    def __init__(self, values: Sequence[Optional[str]]):
+        self.ids: Dict[str, int] = {}
+        self.labels: List[Optional[str]] = [None]
+        row_ids = np.zeros(len(values), dtype=np.int32)
+        for row, value in enumerate(values):
+            key = _normalize(value)
+            if key is None:
+                continue
+            value_id = self.ids.get(key)
+            if value_id is None:
+                value_id = self.ids[key] = len(self.labels)
+                self.labels.append(value.strip())
+            row_ids[row] = value_id
+        self.row_ids = row_ids
+        self.postings, self.offsets = _grouped_postings(
+            row_ids, np.arange(len(values), dtype=np.int32), len(self.labels))
+        self.totals = np.diff(self.offsets)
+        self.totals[0] = 0
+        # Value IDs by descending count over all rows, for unfiltered facets
+        self.ranked = np.argsort(-self.totals, kind='stable')[:np.count_nonzero(self.totals)]
+
+    def rows(self, value: str) -> np.ndarray:
+        value_id = self.ids.get(_normalize(value))
+        if value_id is None:
+            return self.postings[:0]
+        return self.postings[self.offsets[value_id]:self.offsets[value_id + 1]]
+
+    def counts(self, rows: Optional[np.ndarray], limit: int) -> List[Dict[str, Any]]:
+        """The `limit` most frequent values among `rows` (None for all rows), with their counts."""
+        if rows is None:
+            return [{'value': self.labels[value_id], 'count': int(self.totals[value_id])}
+                    for value_id in self.ranked[:limit].tolist()]
+        counts = np.bincount(self.row_ids[rows], minlength=len(self.labels))
+        counts[0] = 0
+        # Count of the limit-th most frequent value; ties there go to the earliest values
+        at_least = np.cumsum(np.bincount(counts)[::-1])[::-1]
+        cutoff = max(int(np.flatnonzero(at_least >= limit)[-1]) if at_least[0] >= limit else 0, 1)
+        above = np.flatnonzero(counts > cutoff)
+        above = above[np.argsort(-counts[above], kind='stable')]
+        top = np.concatenate((above, np.flatnonzero(counts == cutoff)[:limit - len(above)])).tolist()
+        return [{'value': self.labels[value_id], 'count': int(counts[value_id])} for value_id in top]
+
+class SearchIndex:
+    """
+    Read-only query index over a JobTable: an inverted index of description
+    tokens and an exact-match index per SEARCH_FIELDS field. Every posting
+    list is a sorted numpy array of row numbers, so a query intersects
+    arrays instead of scanning rows, and results come back in original
+    message order with the row number as the pagination cursor.
+    """
+
+    def __init__(self, table: JobTable):
+        self.table = table
+        self.size = len(table)
+        self._build_terms(table.column('job_description'))
+        emails = table.column('email')
+        self.fields = {
+            name: _FieldIndex([email.rsplit('@', 1)[-1] if email else None for email in emails]
+                              if name == 'email_domain' else table.column(name))
+            for name in SEARCH_FIELDS
+        }
+        self.dates = np.fromiter((_date_number(value) for value in table.column('date_of_posting')),
+                                 dtype=np.int32, count=self.size)
+
+    def _build_terms(self, descriptions: Sequence[Optional[str]]) -> None:
+        self.terms: Dict[str, int] = {}
+        term_ids, rows = array('i'), array('i')
+        # Reposts repeat descriptions word for word; tokenize each text once
+        seen: Dict[str, array] = {}
+        for row, text in enumerate(descriptions):
+            if not text:
+                continue
+            ids = seen.get(text)
+            if ids is None:
+                ids = seen[text] = array('i', [self.terms.setdefault(token, len(self.terms))
+                                               for token in set(tokenize(text))])
+            term_ids.extend(ids)
+            rows.extend([row] * len(ids))
+        self.term_postings, self.term_offsets = _grouped_postings(
+            np.frombuffer(term_ids, dtype=np.int32), np.frombuffer(rows, dtype=np.int32), len(self.terms))
+
+    def term_rows(self, token: str) -> np.ndarray:
+        term_id = self.terms.get(token)
+        if term_id is None:
+            return self.term_postings[:0]
+        return self.term_postings[self.term_offsets[term_id]:self.term_offsets[term_id + 1]]
+
+    def match(self, query: str = '', filters: Optional[Dict[str, str]] = None,
+              date_from: Optional[str] = None, date_to: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Sorted row numbers of the posts whose description contains every
+        word of `query`, whose fields equal `filters` (case-insensitive)
+        and whose posting date is within [date_from, date_to] (YYYY-MM-DD);
+        None when nothing narrows the match, meaning every row.
+        """
+        postings = [self.term_rows(token) for token in set(tokenize(query))]
+        postings += [self.fields[name].rows(value) for name, value in (filters or {}).items()]
+        rows = None
+        if postings:
+            # Start from the rarest constraint and narrow it down with the others
+            postings.sort(key=len)
+            rows = postings[0]
+            for other in postings[1:]:
+                if not len(rows):
+                    break
+                rows = _intersect(rows, other, self.size)
+        if date_from or date_to:
+            dates = self.dates if rows is None else self.dates[rows]
+            keep = dates > 0
+            if date_from:
+                keep &= dates >= _date_number(date_from)
+            if date_to:
+                keep &= dates <= _date_number(date_to)
+            rows = np.flatnonzero(keep).astype(np.int32) if rows is None else rows[keep]
+        return rows
+
+    def search(self, query: str = '', filters: Optional[Dict[str, str]] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None,
+               facets: Sequence[str] = (), facet_limit: int = 10,
+               limit: int = 50, cursor: Optional[int] = None) -> Dict[str, Any]:
+        """
+        One page of matching posts (see match) after row `cursor`, the
+        total match count, the cursor of the next page (None on the last)
+        and the top `facet_limit` values of each requested facet over all
+        matches.
+        """
+        rows = self.match(query, filters, date_from, date_to)
+        if rows is None:
+            first = 0 if cursor is None else cursor + 1
+            page = list(range(first, min(first + limit, self.size)))
+            total, last = self.size, self.size - 1
+        else:
+            first = 0 if cursor is None else int(np.searchsorted(rows, cursor, side='right'))
+            page = rows[first:first + limit].tolist()
+            total, last = len(rows), int(rows[-1]) if len(rows) else -1
+        return {
+            'total': total,
+            'items': [JobRow(self.table, row).dict() for row in page],
+            'next_cursor': str(page[-1]) if page and page[-1] != last else None,
+            'facets': {name: self.fields[name].counts(rows, facet_limit) for name in facets},
+        }
@@ -0,0 +1,188 @@
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from .dataset_store import DatasetStore
+
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+def _process_start(pid: int) -> Optional[str]:
+    """When a process started, in clock ticks since boot, where /proc tells; None elsewhere."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            # Field 22; the command name before it may contain spaces, so count from its closing paren
+            return f.read().rpartition(')')[2].split()[19]
+    except (OSError, IndexError):
+        return None
+
+# Recorded on every task as the process running it: host, PID, start time
+# and a token of its own, so a restarted server that gets the same PID, or
+# another process that reuses it, is not taken for the one that ran the task
+PROCESS_TOKEN = uuid.uuid4().hex[:12]
+PROCESS_OWNER = f'{socket.gethostname()}:{os.getpid()}:{_process_start(os.getpid()) or ""}:{PROCESS_TOKEN}'
+
+ORPHANED_ERROR = "The server stopped before this upload finished; please upload it again"
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """
+    Whether the process recorded as running a task may still be running.
+    Processes on other hosts cannot be checked and are assumed alive.
+    """
+    fields = owner.rsplit(':', 3) if owner else []
+    if len(fields) != 4:
+        return False
+    host, pid, started, token = fields
+    if host != socket.gethostname():
+        return True
+    if pid == str(os.getpid()):
+        return token == PROCESS_TOKEN
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    except ValueError:
+        return False
+    current = _process_start(int(pid))
+    return not (started and current and current != started)
+
+class TaskQueueFull(RuntimeError):
+    """Raised when too many tasks are already waiting to run, or no slot is free for one run inline."""
+
+@dataclass
+class Task:
+    """A background upload; its ID doubles as the ID of the dataset it produces."""
+    id: str
+    store: DatasetStore
+    status: str = PENDING
+    messages_parsed: int = 0
+    pages_done: int = 0
+
+    def report(self, messages: int, pages: int) -> None:
+        self.messages_parsed += messages
+        self.pages_done += pages
+        self.store.update_dataset(self.id, messages_parsed=self.messages_parsed, pages_done=self.pages_done)
+
+def task_to_dict(dataset: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a dataset record from the store as a task status response."""
+    return {
+        'task_id': dataset['id'],
+        'dataset_id': dataset['id'],
+        'filename': dataset['filename'],
+        'status': dataset['status'],
+        'progress': {
+            'messages_parsed': dataset['messages_parsed'],
+            'messages_total': dataset['messages_total'],
+            'pages_done': dataset['pages_done'],
+            'pages_total': dataset['pages_total'],
+            'messages_skipped': dataset['messages_skipped'],
+            'messages_filtered': dataset['messages_filtered'],
+        },
+        'error': dataset['error'],
+        'created_at': dataset['created_at'],
+        'finished_at': dataset['finished_at'],
+    }
+
+class TaskManager:
+    """
+    Runs uploads on a bounded thread pool so processing never blocks the
+    event loop. At most `max_concurrent` tasks run at once, whether queued
+    or run inline by their caller. Task state is written through to the
+    dataset store, so any server worker can answer status requests.
+    """
+
+    def __init__(self, store: DatasetStore, max_concurrent: int, max_pending: int):
+        self.store = store
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='upload')
+        # One slot per running task, shared by queued and inline tasks
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._active: Dict[str, Task] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, filename: str, work: Callable[[Task], None], **progress: Any) -> Dict[str, Any]:
+        """
+        Queue `work(task)` and return the new task's status.
+        Extra keyword arguments set initial progress fields such as pages_total.
+        """
+        with self._lock:
+            pending = sum(1 for t in self._active.values() if t.status == PENDING)
+            if pending >= self.max_pending:
+                raise TaskQueueFull(f"{pending} uploads are already waiting")
+            task = Task(id=uuid.uuid4().hex, store=self.store)
+            self.store.create_dataset(task.id, filename, PENDING, owner=PROCESS_OWNER, **progress)
+            self._active[task.id] = task
+        self._executor.submit(self._run, task, work)
+        return self.status(task.id)
+
+    def open_task(self, filename: str, **progress: Any) -> Task:
+        """
+        Register a running task that the caller executes itself, such as an
+        upload whose results are streamed back; end it with finish(). It
+        takes a slot like queued tasks do, and TaskQueueFull is raised
+        rather than wait when none is free.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise TaskQueueFull(f"{self.max_concurrent} uploads are already being processed")
+        task = Task(id=uuid.uuid4().hex, store=self.store, status=RUNNING)
+        try:
+            self.store.create_dataset(task.id, filename, RUNNING, owner=PROCESS_OWNER, **progress)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._active[task.id] = task
+        return task
+
+    def finish(self, task: Task, error: Optional[str] = None) -> None:
+        """Mark a task completed, or failed with `error`, and free its slot."""
+        task.status = FAILED if error is not None else COMPLETED
+        fields = {'error': error} if error is not None else {'messages_total': task.messages_parsed}
+        try:
+            self.store.update_dataset(task.id, status=task.status, finished_at=datetime.now().isoformat(),
+                                      **fields)
+        finally:
+            with self._lock:
+                del self._active[task.id]
+            self._slots.release()
+
+    def status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        dataset = self.store.get_dataset(task_id)
+        return task_to_dict(dataset) if dataset else None
+
+    def fail_orphaned(self) -> List[str]:
+        """
+        Mark as failed the pending and running tasks whose process has died,
+        so clients polling them stop waiting; returns their IDs. Run at
+        startup, before this process starts any task of its own.
+        """
+        orphaned = [dataset['id'] for dataset in self.store.find_datasets((PENDING, RUNNING))
+                    if not _owner_alive(dataset['owner'])]
+        now = datetime.now().isoformat()
+        for dataset_id in orphaned:
+            self.store.update_dataset(dataset_id, status=FAILED, error=ORPHANED_ERROR, finished_at=now)
+        return orphaned
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, task: Task, work: Callable[[Task], None]) -> None:
+        # Inline tasks may hold slots this executor thread would otherwise use
+        self._slots.acquire()
+        try:
+            task.status = RUNNING
+            self.store.update_dataset(task.id, status=RUNNING)
+            work(task)
+        except Exception as e:
+            self.finish(task, str(e))
+        else:
+            self.finish(task)
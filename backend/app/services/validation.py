@@ -0,0 +1,48 @@
+from typing import Any, Dict, Optional
+from .lru_cache import LRUCache
+from .. import config
+
+# Counters that make up a validation cache's statistics
+VALIDATION_COUNTERS = ('hits', 'misses', 'evictions')
+
+_MISSING = object()
+
+# Verdicts by raw value; None means the value was rejected
+_emails = LRUCache(config.VALIDATION_CACHE_SIZE)
+_phones = LRUCache(config.VALIDATION_CACHE_SIZE)
+
+def normalize_email(raw: str) -> Optional[str]:
+    """
+    Normalized form of an email address, or None if it is not valid.
+    Only syntax is checked: deliverability (DNS) checks are always off, so
+    validation never waits on the network.
+    """
+    verdict = _emails.get(raw, _MISSING)
+    if verdict is _MISSING:
+        from email_validator import validate_email, EmailNotValidError
+        try:
+            verdict = validate_email(raw, check_deliverability=False).normalized
+        except EmailNotValidError:
+            verdict = None
+        _emails.put(raw, verdict)
+    return verdict
+
+def normalize_phone(raw: str) -> Optional[str]:
+    """Phone number in international format, or None if it cannot be parsed or is not valid."""
+    verdict = _phones.get(raw, _MISSING)
+    if verdict is _MISSING:
+        import phonenumbers
+        try:
+            parsed = phonenumbers.parse(raw, None)
+            if phonenumbers.is_valid_number(parsed):
+                verdict = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+            else:
+                verdict = None
+        except phonenumbers.NumberParseException:
+            verdict = None
+        _phones.put(raw, verdict)
+    return verdict
+
+def validation_stats() -> Dict[str, Dict[str, Any]]:
+    """Hit/miss counters of the email and phone verdict caches in this process."""
+    return {'email': _emails.stats(), 'phone': _phones.stats()}
@@ -1,136 +1,546 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import StreamingResponse, FileResponse
-from ..controllers.job_controller import process_html_file
-from ..services.exporter import export_to_csv
-from ..services.excel_exporter import ExcelExporter
-from typing import List
-import io
+from fastapi import APIRouter, UploadFile, File, Form, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse, FileResponse
+from starlette.concurrency import run_in_threadpool
+from ..controllers.job_controller import (
+    process_html_files, iter_html_files, cache_stats, validation_stats, IngestStats,
+)
+from ..services.archive import collect_pages, ArchiveError, ArchiveTooLarge, UploadSource
+from ..services.parser import estimate_message_count
+from ..services.tasks import Task, TaskManager, TaskQueueFull, task_to_dict, COMPLETED, FAILED, RUNNING
+from ..services.dataset_store import DatasetStore
+from ..services.lru_cache import LRUCache
+from ..services import metrics
+from .. import config
+from ..services.exporter import iter_csv, iter_ndjson, write_parquet, ExportUnavailable
+from ..models.job_post import JOB_POST_FIELDS, SEARCH_FIELDS
+from ..models.job_table import JobTable
+from ..services.excel_exporter import ExcelExporter, JOB_FIELDS
+from ..services.export_cache import ExportCache
+from ..services.contact_stats import (
+    ContactStats, SAMPLE_SIZE as CONTACT_SAMPLE_SIZE, TOP_SIZE as CONTACT_TOP_SIZE,
+)
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Literal, Optional
+import anyio
+import hashlib
+import json
+import orjson
 import os
+import shutil
 import tempfile
-from datetime import datetime
+import time
+from datetime import date
 
 router = APIRouter()
 
-# In-memory storage for latest job posts (for simplicity)
-latest_job_posts = []
+# Uploaded datasets, persisted so every server worker sees the same results
+store = DatasetStore(config.DATASET_DB_PATH)
 
-@router.post("/upload", response_model=List[dict])
-async def upload_file(file: UploadFile = File(...)):
-    if not file.filename.endswith('.html'):
-        raise HTTPException(status_code=400, detail="File must be an HTML file")
-    
-    content = await file.read()
-    html_content = content.decode('utf-8')
-    
-    global latest_job_posts
-    latest_job_posts = process_html_file(html_content)
-    
-    return [job.dict() for job in latest_job_posts]
+# Background upload processing, bounded by MAX_CONCURRENT_TASKS
+task_manager = TaskManager(store, config.MAX_CONCURRENT_TASKS, config.MAX_PENDING_TASKS)
 
-@router.get("/download")
-async def download_csv():
-    global latest_job_posts
-    if not latest_job_posts:
-        raise HTTPException(status_code=404, detail="No data available for download")
-    
-    csv_content = export_to_csv([job.dict() for job in latest_job_posts])
-    
-    return StreamingResponse(
-        io.StringIO(csv_content),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=job_posts.csv"}
-    )
+# Finished datasets recently read, by dataset ID; they never change once finished
+result_tables = LRUCache(config.RESULT_TABLE_CACHE_SIZE)
 
-@router.get("/download/excel")
-async def download_excel():
-    """Download job data as Excel file with multiple sheets"""
-    global latest_job_posts
-    if not latest_job_posts:
-        raise HTTPException(status_code=404, detail="No data available for download")
-    
-    exporter = ExcelExporter()
-    
-    # Create temporary file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    temp_dir = tempfile.gettempdir()
-    filename = f"telegram_jobs_{timestamp}.xlsx"
-    filepath = os.path.join(temp_dir, filename)
-    
+# Query indexes of recently searched datasets, by dataset ID
+search_indexes = LRUCache(config.RESULT_TABLE_CACHE_SIZE)
+
+# Generated downloads on disk, shared by all server workers
+export_cache = ExportCache(config.EXPORT_CACHE_DIR, config.EXPORT_CACHE_MAX_BYTES)
+
+# Largest page a search returns
+MAX_SEARCH_LIMIT = 500
+
+# A streamed upload sends its records at least every STREAM_FLUSH_SECONDS
+# (or every STREAM_FLUSH_ROWS records) and stores them STREAM_STORE_ROWS at a time
+STREAM_FLUSH_ROWS = 100
+STREAM_FLUSH_SECONDS = 0.05
+STREAM_STORE_ROWS = 1000
+
+async def _save_upload(upload: UploadFile, path: str) -> int:
+    """Copy an upload to disk one chunk at a time; returns its size in bytes."""
+    size = 0
+    with open(path, 'wb') as out:
+        while True:
+            chunk = await upload.read(config.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return size
+            await run_in_threadpool(out.write, chunk)
+            size += len(chunk)
+
+def _require_dataset(dataset_id: str, purpose: str) -> None:
+    """Fail with 404 unless the dataset finished and has job posts."""
+    dataset = store.get_dataset(dataset_id)
+    if dataset is None or dataset['status'] != COMPLETED or not store.count_job_posts(dataset_id):
+        raise HTTPException(status_code=404, detail=f"No data available for {purpose}")
+
+def _load_table(dataset_id: str, purpose: str) -> JobTable:
+    """A finished dataset's job posts, from memory when recently used, or fail with 404."""
+    table = result_tables.get(dataset_id)
+    if table is None:
+        _require_dataset(dataset_id, purpose)
+        with metrics.stage('load_table'):
+            table = store.load_job_table(dataset_id)
+        result_tables.put(dataset_id, table)
+    return table
+
+def _commit_watermarks(dataset_id: str, watermarks: Optional[Dict[str, int]], stats: IngestStats) -> None:
+    """
+    Record the highest message ID ingested per chat, once the dataset's job
+    posts are stored, so a failed insert never leaves messages skipped by
+    later incremental uploads. An incremental ingest (`watermarks` as read
+    when it started) fails instead, and its job posts are removed, if
+    another one advanced any of its chats meanwhile, since both would hold
+    the same messages.
+    """
+    if watermarks is None:
+        store.update_watermarks(stats.max_message_ids)
+        return
+    moved = store.advance_watermarks(watermarks, stats.max_message_ids)
+    if moved:
+        store.delete_job_posts(dataset_id)
+        raise RuntimeError(f"Another incremental upload of {', '.join(sorted(moved))} finished first; "
+                           f"upload again to ingest only the newer messages")
+
+@router.post("/upload", status_code=202)
+async def upload_file(
+    file: List[UploadFile] = File(...),
+    incremental: bool = Form(False),
+    chat: Optional[str] = Form(None),
+    dedup: bool = Form(False),
+    dedup_threshold: Optional[float] = Form(None),
+    filter_noise: bool = Form(True),
+    stream: bool = Form(False),
+):
+    """
+    Upload one or more export pages (messages*.html) or a ZIP of a whole export.
+    Uploads are copied to disk in chunks and parsed incrementally from there.
+    Processing runs in the background; poll /tasks/{task_id} for progress.
+
+    With `stream`, the upload is processed while the request is open and
+    the response is NDJSON, one job post per line, sent as records are
+    extracted. The dataset ID is in the X-Dataset-Id header. It is parsed
+    from the uploaded files as received, and gets 429 unless a processing
+    slot is free right away.
+
+    With `incremental`, messages at or below the highest message ID already
+    ingested for their chat are skipped. The chat is identified by the
+    export's page header unless `chat` names it explicitly; chats that
+    share a title share a watermark, so give each its own `chat`. If another
+    incremental upload of the same chat finishes first, this one fails
+    rather than store the same messages twice.
+
+    With `dedup`, near-duplicate reposts are folded into their earliest
+    post, which records how many times it was reposted.
+
+    With `filter_noise` (the default), messages that are not job postings
+    (join/leave notices, pins, media placeholders, chatter) are dropped
+    before extraction; the task reports how many as messages_filtered.
+    """
+    if dedup_threshold is not None and not 0 < dedup_threshold <= 1:
+        raise HTTPException(status_code=400, detail="dedup_threshold must be between 0 and 1")
+    threshold = (dedup_threshold or config.DEDUP_THRESHOLD) if dedup else None
+    if stream and dedup:
+        raise HTTPException(status_code=400, detail="dedup needs the whole export and cannot be streamed")
+    for upload in file:
+        if not upload.filename.lower().endswith(('.html', '.zip')):
+            raise HTTPException(status_code=400, detail="Files must be HTML pages or a ZIP archive")
+    if stream:
+        return await _stream_upload(file, incremental, chat, filter_noise)
+
+    os.makedirs(config.UPLOAD_DIR, exist_ok=True)
+    workdir = tempfile.mkdtemp(dir=config.UPLOAD_DIR)
     try:
-        # Create Excel file
-        exporter.create_excel_file([job.dict() for job in latest_job_posts], filepath)
+        uploads = []
+        for index, upload in enumerate(file):
+            path = Path(workdir, f'upload{index}{os.path.splitext(upload.filename)[1].lower()}')
+            metrics.inc('bytes_ingested', await _save_upload(upload, str(path)))
+            uploads.append((upload.filename, path))
+        metrics.inc('uploads')
         
-        # Return file
-        return FileResponse(
-            filepath,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-            filename=filename
-        )
-    except Exception as e:
-        # Clean up temp file if it exists
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        raise HTTPException(status_code=500, detail=f"Failed to create Excel file: {str(e)}")
-
-@router.get("/download/contacts")
-async def download_contacts():
-    """Download only contact information (emails and names) as Excel file"""
-    global latest_job_posts
-    if not latest_job_posts:
-        raise HTTPException(status_code=404, detail="No data available for download")
+        try:
+            pages = await run_in_threadpool(collect_pages, uploads, workdir)
+        except ArchiveTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ArchiveError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        paths = [path for _, path in pages]
+        filename = ', '.join(name for name, _ in uploads)
+        progress = {
+            'pages_total': len(paths),
+            'messages_total': await run_in_threadpool(lambda: sum(estimate_message_count(p) for p in paths)),
+        }
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
     
-    exporter = ExcelExporter()
+    def work(task: Task) -> None:
+        try:
+            watermarks = store.get_watermarks() if incremental else None
+            stats = IngestStats()
+            job_posts = process_html_files(paths, task.report, watermarks, chat, stats, threshold, filter_noise)
+            with metrics.stage('contact_stats', stats.timings):
+                contacts = ContactStats().add_all(job_posts.dicts())
+            with metrics.stage('store', stats.timings):
+                store.add_job_posts(task.id, job_posts)
+                _commit_watermarks(task.id, watermarks, stats)
+            store.update_dataset(task.id, messages_skipped=stats.skipped, messages_filtered=stats.filtered,
+                                 stage_seconds=json.dumps(stats.timings.totals()),
+                                 contact_stats=json.dumps(contacts.summary()))
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
     
-    # Create temporary file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    temp_dir = tempfile.gettempdir()
-    filename = f"telegram_contacts_{timestamp}.xlsx"
-    filepath = os.path.join(temp_dir, filename)
+    try:
+        task = task_manager.submit(filename, work, **progress)
+    except TaskQueueFull as e:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise HTTPException(status_code=429, detail=f"Server busy: {e}")
     
+    return task
+
+STREAM_INTERRUPTED = "Upload stream was interrupted"
+
+class _RecordStream(StreamingResponse):
+    """
+    The NDJSON response of a streamed upload. Its task is ended however the
+    response ends, so when the client disconnects midway the dataset is
+    marked failed and the slot freed right away, not whenever the records
+    generator happens to be garbage collected.
+    """
+
+    def __init__(self, task: Task, records: Iterator[bytes], workdir: str):
+        super().__init__(records, media_type="application/x-ndjson", headers={"X-Dataset-Id": task.id})
+        self.task = task
+        self.records = records
+        self.workdir = workdir
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(self.records.close)
+                # A generator closed before it started never ran its own cleanup
+                await run_in_threadpool(_end_stream, self.task, self.workdir, STREAM_INTERRUPTED)
+
+def _end_stream(task: Task, workdir: str, error: Optional[str]) -> None:
+    """Finish a streamed upload's task unless already finished, and remove its extracted pages."""
+    if task.status == RUNNING:
+        task_manager.finish(task, error)
+    shutil.rmtree(workdir, ignore_errors=True)
+
+async def _stream_upload(file: List[UploadFile], incremental: bool, chat: Optional[str],
+                         filter_noise: bool) -> StreamingResponse:
+    """
+    Start a streamed upload in a processing slot, or fail with 429 when none
+    is free. Pages are read from the request's own spooled files, which
+    FastAPI 0.118+ keeps open until the response is sent; only archive
+    members are extracted to disk. The message total is unknown
+    until the upload finishes.
+    """
+    filename = ', '.join(upload.filename for upload in file)
     try:
-        # Create contacts-only Excel file
-        exporter.create_contacts_only_excel([job.dict() for job in latest_job_posts], filepath)
-        
-        # Return file
-        return FileResponse(
-            filepath,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-            filename=filename
+        task = task_manager.open_task(filename)
+    except TaskQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Server busy: {e}")
+    metrics.inc('uploads')
+    metrics.inc('bytes_ingested', sum(upload.size or 0 for upload in file))
+    workdir = None
+    try:
+        os.makedirs(config.UPLOAD_DIR, exist_ok=True)
+        workdir = tempfile.mkdtemp(dir=config.UPLOAD_DIR)
+        uploads = [(upload.filename, upload.file) for upload in file]
+        pages = await run_in_threadpool(collect_pages, uploads, workdir)
+        store.update_dataset(task.id, pages_total=len(pages))
+    except BaseException as e:
+        task_manager.finish(task, str(e) or "Upload could not be read")
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if isinstance(e, ArchiveError):
+            raise HTTPException(status_code=413 if isinstance(e, ArchiveTooLarge) else 400, detail=str(e))
+        raise
+    records = _stream_records(task, [page for _, page in pages], workdir, incremental, chat, filter_noise)
+    return _RecordStream(task, records, workdir)
+
+def _stream_records(task: Task, pages: List[UploadSource], workdir: str, incremental: bool,
+                    chat: Optional[str], filter_noise: bool) -> Iterator[bytes]:
+    """
+    Extract an upload's job posts while the response is open, sending them
+    as NDJSON lines and storing them in batches as the dataset of `task`.
+    If the generator is closed before the end, the dataset is marked failed.
+    """
+    stats = IngestStats()
+    contacts = ContactStats()
+    batch, lines = JobTable(), []
+    flushed = None
+    error = STREAM_INTERRUPTED
+    try:
+        watermarks = store.get_watermarks() if incremental else None
+        for record in iter_html_files(pages, task.report, watermarks, chat, stats, filter_noise):
+            batch.append(record)
+            job = batch[-1].dict()
+            with metrics.stage('contact_stats', stats.timings):
+                contacts.add(job)
+            lines.append(orjson.dumps(job))
+            if len(batch) >= STREAM_STORE_ROWS:
+                with metrics.stage('store', stats.timings):
+                    store.add_job_posts(task.id, batch)
+                batch = JobTable()
+            now = time.monotonic()
+            if flushed is None or len(lines) >= STREAM_FLUSH_ROWS or now - flushed >= STREAM_FLUSH_SECONDS:
+                lines.append(b'')
+                yield b'\n'.join(lines)
+                lines, flushed = [], now
+        if lines:
+            lines.append(b'')
+            yield b'\n'.join(lines)
+        with metrics.stage('store', stats.timings):
+            store.add_job_posts(task.id, batch)
+            _commit_watermarks(task.id, watermarks, stats)
+        store.update_dataset(task.id, messages_skipped=stats.skipped, messages_filtered=stats.filtered,
+                             stage_seconds=json.dumps(stats.timings.totals()),
+                             contact_stats=json.dumps(contacts.summary()))
+        error = None
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        _end_stream(task, workdir, error)
+
+@router.get("/tasks/{task_id}")
+def get_task(task_id: str):
+    """
+    Report the status and progress of an upload. A profiled request
+    (X-Profile header) also gets the upload's stage breakdown once it is done.
+    """
+    dataset = store.get_dataset(task_id)
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="Unknown task")
+    if dataset['stage_seconds']:
+        metrics.add_to_profile(json.loads(dataset['stage_seconds']))
+    return task_to_dict(dataset)
+
+@router.get("/tasks/{task_id}/results")
+def get_task_results(task_id: str):
+    """Fetch the extracted job posts of a finished upload, as a JSON array"""
+    task = task_manager.status(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Unknown task")
+    if task['status'] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Processing failed: {task['error']}")
+    if task['status'] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Task is still {task['status']}")
+    table = _load_table(task_id, "results") if store.count_job_posts(task_id) else JobTable()
+    with metrics.stage('serialize_json'):
+        body = table.to_json()
+    return Response(body, media_type="application/json")
+
+@router.get("/search")
+def search_job_posts(
+    dataset_id: str,
+    q: str = '',
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    job_title: Optional[str] = None,
+    email_domain: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    facets: List[Literal[SEARCH_FIELDS]] = Query([]),
+    facet_limit: int = Query(10, ge=1, le=100),
+    limit: int = Query(50, ge=1, le=MAX_SEARCH_LIMIT),
+    cursor: Optional[str] = None,
+):
+    """
+    Search a dataset's job posts: every word of `q` must appear in the
+    description, field filters match exactly (case-insensitive) and dates
+    are inclusive. Returns one page in original message order, the total
+    match count, `next_cursor` for the following page and, per requested
+    facet, the most common values among all matches. The dataset's index
+    is built on its first search and kept in memory.
+    """
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    index = search_indexes.get(dataset_id)
+    if index is None:
+        from ..services.search_index import SearchIndex
+        table = _load_table(dataset_id, "search")
+        with metrics.stage('build_index'):
+            index = SearchIndex(table)
+        search_indexes.put(dataset_id, index)
+    filters = {name: value for name, value in (('company', company), ('location', location),
+                                               ('job_title', job_title), ('email_domain', email_domain))
+               if value}
+    with metrics.stage('search'):
+        result = index.search(
+            q, filters,
+            date_from.isoformat() if date_from else None, date_to.isoformat() if date_to else None,
+            facets, facet_limit, limit, int(cursor) if cursor is not None else None,
         )
+        body = orjson.dumps(result)
+    return Response(body, media_type="application/json")
+
+@router.get("/stats/cache")
+def get_cache_stats():
+    """Extraction cache hit/miss counters, showing work saved on repeated messages"""
+    return cache_stats()
+
+@router.get("/stats/validation")
+def get_validation_stats():
+    """Email and phone verdict cache counters, showing validations skipped for repeated contacts"""
+    return validation_stats()
+
+def _column_digests(dataset_id: str) -> Dict[str, str]:
+    """
+    Per-column hashes of a finished dataset, computed on its first export
+    and kept in the store, so later requests need no table; 404 if there
+    is no data.
+    """
+    dataset = store.get_dataset(dataset_id)
+    if dataset is not None and dataset['column_digests']:
+        return json.loads(dataset['column_digests'])
+    digests = _load_table(dataset_id, "download").digests()
+    store.update_dataset(dataset_id, column_digests=json.dumps(digests))
+    return digests
+
+def _write_csv(table: JobTable, path: str) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(iter_csv(table, JOB_POST_FIELDS))
+
+def _write_ndjson(table: JobTable, path: str) -> None:
+    with open(path, 'wb') as f:
+        f.writelines(iter_ndjson(table))
+
+def _write_parquet(table: JobTable, path: str) -> None:
+    write_parquet(table, path, JOB_POST_FIELDS)
+
+def _write_excel(table: JobTable, path: str) -> None:
+    ExcelExporter().create_excel_file(table.dicts(), path)
+
+def _write_contacts(table: JobTable, path: str) -> None:
+    ExcelExporter().create_contacts_only_excel(table.dicts(), path)
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Downloads by kind: file suffix, media type, download name, the dataset
+# columns the file is made from, and its writer
+EXPORTS = {
+    'csv': ('.csv', "text/csv", "job_posts.csv", JOB_POST_FIELDS, _write_csv),
+    'ndjson': ('.ndjson', "application/x-ndjson", "job_posts.ndjson", JOB_POST_FIELDS, _write_ndjson),
+    'parquet': ('.parquet', "application/vnd.apache.parquet", "job_posts.parquet", JOB_POST_FIELDS,
+                _write_parquet),
+    'excel': ('.xlsx', XLSX, "telegram_jobs.xlsx", JOB_FIELDS, _write_excel),
+    'contacts': ('.xlsx', XLSX, "telegram_contacts.xlsx", JOB_FIELDS, _write_contacts),
+}
+
+def _check_export_fields() -> None:
+    """Fail at import if an export names a field that is not a dataset column, which no ETag would cover."""
+    for kind, (*_, fields, _) in EXPORTS.items():
+        unknown = [name for name in fields if name not in JOB_POST_FIELDS]
+        if unknown:
+            raise ValueError(f"{kind} export uses unknown dataset columns: {', '.join(unknown)}")
+
+_check_export_fields()
+
+# Part of every export's version; bump it when a writer's output changes so
+# files cached by an older release are not served
+EXPORT_FORMAT_VERSION = 3
+
+def _export_response(dataset_id: str, kind: str, if_none_match: Optional[str]) -> Response:
+    """
+    Serve one export of a dataset from the export cache, generating it on
+    first request. Its ETag is the version of the columns it is made from,
+    so a client that already holds it gets 304 Not Modified, and a change
+    to other columns leaves it cached.
+    """
+    suffix, media_type, filename, fields, write = EXPORTS[kind]
+    digests = _column_digests(dataset_id)
+    version = hashlib.blake2b(f'{EXPORT_FORMAT_VERSION}:{kind}'.encode(), digest_size=16)
+    for name in fields:
+        version.update(digests[name].encode())
+    etag = f'"{version.hexdigest()}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if if_none_match and (if_none_match.strip() == '*' or etag in
+                          (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))):
+        return Response(status_code=304, headers=headers)
+
+    def build(path: str) -> None:
+        table = _load_table(dataset_id, "download")
+        with metrics.stage(f'export_{kind}'):
+            write(table, path)
+
+    try:
+        path = export_cache.get_or_create(version.hexdigest() + suffix, build)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        # Clean up temp file if it exists
-        if os.path.exists(filepath):
-            os.remove(filepath)
-        raise HTTPException(status_code=500, detail=f"Failed to create contacts file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create {filename}: {str(e)}")
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+
+@router.get("/download")
+def download_csv(dataset_id: str, format: Literal['csv', 'ndjson', 'parquet'] = 'csv',
+                 if_none_match: Optional[str] = Header(None)):
+    """
+    Download a dataset as CSV (default), NDJSON or Parquet. The file is
+    generated once per version of the data and then served from the
+    export cache; send its ETag in If-None-Match to get 304 when unchanged.
+    """
+    return _export_response(dataset_id, format, if_none_match)
+
+@router.get("/download/excel")
+def download_excel(dataset_id: str, if_none_match: Optional[str] = Header(None)):
+    """Download job data as Excel file with multiple sheets, cached like /download"""
+    return _export_response(dataset_id, 'excel', if_none_match)
+
+@router.get("/download/contacts")
+def download_contacts(dataset_id: str, if_none_match: Optional[str] = Header(None)):
+    """Download only contact information (emails and names) as Excel file, cached like /download"""
+    return _export_response(dataset_id, 'contacts', if_none_match)
+
+def _contact_summary(dataset_id: str) -> Dict[str, Any]:
+    """
+    A finished dataset's contact statistics, as recorded at ingest. Datasets
+    stored before they were recorded are counted once, then kept. Like the
+    downloads, 404 when the dataset has no job posts.
+    """
+    dataset = store.get_dataset(dataset_id)
+    if dataset is not None and dataset['status'] == COMPLETED and dataset['contact_stats']:
+        summary = json.loads(dataset['contact_stats'])
+        if not summary['total_jobs']:
+            raise HTTPException(status_code=404, detail="No data available for analysis")
+        return summary
+    table = _load_table(dataset_id, "analysis")
+    with metrics.stage('contact_stats'):
+        summary = ContactStats().add_all(table.dicts()).summary()
+    store.update_dataset(dataset_id, contact_stats=json.dumps(summary))
+    return summary
 
 @router.get("/analyze/contacts")
-async def analyze_contacts():
-    """Analyze contact information in current job data"""
-    global latest_job_posts
-    if not latest_job_posts:
-        raise HTTPException(status_code=404, detail="No data available for analysis")
-    
-    exporter = ExcelExporter()
-    contact_info = exporter.extract_contact_info([job.dict() for job in latest_job_posts])
-    
-    # Create analysis summary
-    total_jobs = len(latest_job_posts)
-    jobs_with_contacts = len(set([c['Job_Index'] for c in contact_info]))
-    total_emails = len([c for c in contact_info if c['Email']])
-    total_names = len([c for c in contact_info if c['Name']])
-    unique_emails = len(set([c['Email'] for c in contact_info if c['Email']]))
-    unique_names = len(set([c['Name'] for c in contact_info if c['Name']]))
-    
+def analyze_contacts(
+    dataset_id: str,
+    top: int = Query(10, ge=0, le=CONTACT_TOP_SIZE),
+    sample: int = Query(5, ge=0, le=CONTACT_SAMPLE_SIZE),
+):
+    """
+    Analyze contact information in a dataset: counts, the `top` most common
+    email domains and companies, and the first `sample` contacts found.
+    The statistics are recorded while the dataset is ingested, so this is a
+    lookup however large the dataset is.
+    """
+    summary = _contact_summary(dataset_id)
+    total_jobs = summary['total_jobs']
+    jobs_with_contacts = summary['jobs_with_contacts']
     return {
         "total_jobs": total_jobs,
         "jobs_with_contacts": jobs_with_contacts,
-        "total_contacts_found": len(contact_info),
-        "total_emails": total_emails,
-        "total_names": total_names,
-        "unique_emails": unique_emails,
-        "unique_names": unique_names,
+        "total_contacts_found": summary['total_contacts_found'],
+        "total_emails": summary['total_emails'],
+        "total_names": summary['total_names'],
+        "unique_emails": summary['unique_emails'],
+        "unique_names": summary['unique_names'],
         "contact_extraction_rate": f"{(jobs_with_contacts/total_jobs)*100:.1f}%" if total_jobs > 0 else "0%",
-        "sample_contacts": contact_info[:5]  # First 5 contacts as sample
-    }
\ No newline at end of file
+        "top_email_domains": summary['top_email_domains'][:top],
+        "top_companies": summary['top_companies'][:top],
+        "sample_contacts": summary['sample_contacts'][:sample],
+    }
@@ -0,0 +1,37 @@
+"""
+Heavy libraries are imported by the endpoints that first need them, so the
+server starts quickly. warm_up loads them ahead of the first request
+instead; it runs at startup when WARM_UP is set.
+"""
+import importlib
+import time
+
+from .services import metrics
+
+# Modules that are imported lazily, on the first request that needs them
+LAZY_MODULES = (
+    'lxml.etree',          # streaming parser
+    'bs4',                 # legacy parse_html
+    'email_validator',     # email validation
+    'phonenumbers',        # phone validation
+    'xlsxwriter',          # Excel downloads
+    'numpy',               # dedup and search
+    f'{__package__}.services.dedup',
+    f'{__package__}.services.search_index',
+)
+
+def warm_up() -> float:
+    """
+    Import every LAZY_MODULES module and prime the validators' compiled
+    patterns and phone metadata. Returns the seconds it took, which are
+    also reported as a 'warm_up' stage.
+    """
+    start = time.perf_counter()
+    with metrics.stage('warm_up'):
+        for name in LAZY_MODULES:
+            importlib.import_module(name)
+        from email_validator import validate_email
+        import phonenumbers
+        validate_email('warm.up@example.com', check_deliverability=False)
+        phonenumbers.is_valid_number(phonenumbers.parse('+1 202 555 0100', None))
+    return time.perf_counter() - start
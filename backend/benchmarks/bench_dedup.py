@@ -0,0 +1,63 @@
+"""
+Scale test for near-duplicate detection on synthetic job posts, a share
+of which are lightly edited reposts of earlier posts:
+
+    python -m benchmarks.bench_dedup --posts 10000 100000 1000000
+"""
+import argparse
+import random
+import resource
+import time
+
+from .synthetic_export import job_text
+
+EDITS = [
+    lambda words, rng: words + [rng.choice(['🔥', 'Urgent!', 'ASAP', 'Share with friends'])],
+    lambda words, rng: [rng.choice(['Hiring:', 'Opening:', 'Vacancy:'])] + words,
+    lambda words, rng: [w for i, w in enumerate(words) if i != rng.randrange(len(words))],
+]
+
+def synthetic_posts(count: int, repost_rate: float, seed: int = 0):
+    """Posts plus, for each, the index of the original it reposts (or itself)."""
+    rng = random.Random(seed)
+    posts, origins = [], []
+    for index in range(count):
+        if posts and rng.random() < repost_rate:
+            origin = origins[rng.randrange(len(posts))]
+            words = posts[origin].split()
+            posts.append(' '.join(rng.choice(EDITS)(words, rng)))
+            origins.append(origin)
+        else:
+            posts.append(job_text(rng, index).replace('<br>', ' ') +
+                         f" Ref {rng.randrange(10 ** 9)} batch {rng.choice(['2024', '2025'])}")
+            origins.append(index)
+    return posts, origins
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repost-rate', type=float, default=0.3)
+    parser.add_argument('--threshold', type=float, default=0.7)
+    parser.add_argument('--num-perm', type=int, default=64)
+    args = parser.parse_args()
+
+    from app.services.dedup import find_near_duplicates
+
+    print(f"{'posts':>9} {'seconds':>8} {'posts/s':>9} {'peak RSS MB':>12} {'groups':>8} {'planted':>8} {'recall':>7} {'precision':>9}")
+    for count in args.posts:
+        posts, origins = synthetic_posts(count, args.repost_rate)
+        start = time.perf_counter()
+        groups = find_near_duplicates(posts, args.threshold, args.num_perm).tolist()
+        elapsed = time.perf_counter() - start
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        reposts = [i for i in range(count) if origins[i] != i]
+        found = sum(1 for i in reposts if groups[i] == groups[origins[i]])
+        folded = [i for i in range(count) if groups[i] != i]
+        correct = sum(1 for i in folded if origins[i] == origins[groups[i]])
+        print(f"{count:>9} {elapsed:>8.2f} {count / elapsed:>9.0f} {peak_kb / 1024:>12.1f} "
+              f"{len(set(groups)):>8} {count - len(reposts):>8} "
+              f"{found / max(len(reposts), 1):>7.3f} {correct / max(len(folded), 1):>9.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Build the full and contacts-only Excel workbooks from synthetic job posts
+and report build time and peak memory:
+
+    python -m benchmarks.bench_excel --jobs 10000 100000
+"""
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from .synthetic_export import job_text
+
+def synthetic_jobs(count: int, seed: int = 0):
+    """Job dicts shaped like the ones the Excel exporter reads."""
+    rng = random.Random(seed)
+    for index in range(count):
+        text = job_text(rng, index).replace('<br>', ' ')
+        yield {
+            'job_description': text,
+            'company': text.split('Company: ')[1].split(' Location:')[0],
+            'job_title': '',
+            'location': '',
+            'date_of_posting': f'2024-01-{index % 28 + 1:02d}',
+        }
+
+def run(kind: str, jobs: int) -> None:
+    from app.services.excel_exporter import ExcelExporter
+    exporter = ExcelExporter()
+    build = exporter.create_excel_file if kind == 'full' else exporter.create_contacts_only_excel
+    fd, path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        build(synthetic_jobs(jobs), path)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+    finally:
+        os.remove(path)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{kind:>9} {jobs:>9,} jobs  {elapsed:7.2f} s  {peak:7.1f} MB peak RSS  {size / 1e6:6.1f} MB file")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--run', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run(args.run[0], int(args.run[1]))
+        return
+    # One process per build so peak RSS is not inherited from the previous run
+    for jobs in args.jobs:
+        for kind in ('full', 'contacts'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_excel', '--run', kind, str(jobs)], check=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Per-message micro-benchmark of the shared extraction engine against the
+previous per-field regex scans (kept here verbatim as the baseline):
+
+    python -m benchmarks.bench_extraction --messages 5000
+"""
+import argparse
+import io
+import re
+import time
+
+from .synthetic_export import write_export
+
+LEGACY_EMAIL_PATTERNS = [
+    r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+    r'\b[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\s*\.\s*[A-Z|a-z]{2,}\b',
+    r'\b[A-Za-z0-9._%+-]+\(at\)[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+]
+LEGACY_NAME_PATTERNS = [
+    r'(?:contact|reach out|email|send cv|apply to|hr|recruiter|hiring manager)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)',
+    r'(?:contact person|contact|coordinator|manager)[\s:]*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)(?:\s*-\s*(?:hr|recruiter|hiring|manager|coordinator))',
+    r'(?:for more details|contact|reach)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
+]
+
+def legacy_fields(text):
+    def first(pattern, group=0):
+        match = re.search(pattern, text)
+        if not match:
+            return None
+        return match.group(group).strip() if group else match.group(0)
+    return {
+        'email': first(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+        'phone': first(r'\+?\d[\d\s\-\(\)]{8,}\d'),
+        'link': first(r'https?://[^\s]+'),
+        'job_title': first(r'(?i)job\s*title\s*[:\-]?\s*([^\n\r]+)', 1),
+        'company': first(r'(?i)company\s*[:\-]?\s*([^\n\r]+)', 1),
+        'location': first(r'(?i)location\s*[:\-]?\s*([^\n\r]+)', 1),
+        'date_of_posting': first(r'\b\d{4}-\d{2}-\d{2}\b'),
+    }
+
+def legacy_emails(text):
+    emails = set()
+    for pattern in LEGACY_EMAIL_PATTERNS:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            clean_email = re.sub(r'\s+', '', match).replace('(at)', '@').lower()
+            if '@' in clean_email and '.' in clean_email:
+                emails.add(clean_email)
+    return emails
+
+def legacy_names(text):
+    names = set()
+    for pattern in LEGACY_NAME_PATTERNS:
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            if match.group(1):
+                name = match.group(1).strip()
+                if (len(name) > 2 and 'job' not in name.lower() and 'work' not in name.lower()
+                        and 'position' not in name.lower() and len(name.split()) <= 4):
+                    names.add(name)
+    return names
+
+NOISE = [
+    'Rahul joined group by link from Group',
+    'Photo',
+    'Good morning everyone',
+    'Contact Priya Sharma - HR for referrals',
+    'Send CV to careers(at)initech.io, reach out to Amit Verma',
+]
+
+def sample_messages(count):
+    from app.services.parser import iter_messages
+    buffer = io.StringIO()
+    write_export(buffer, count)
+    jobs = list(iter_messages(buffer.getvalue()))
+    return [NOISE[i % len(NOISE)] if i % 3 == 0 else text for i, text in enumerate(jobs)]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    from app.services.extraction import extract_all
+
+    messages = sample_messages(args.messages)
+    for text in messages:
+        result = extract_all(text)
+        assert result.fields == legacy_fields(text), text
+        assert set(result.emails) == legacy_emails(text), text
+        assert set(result.names) == legacy_names(text), text
+
+    def legacy(text):
+        legacy_fields(text)
+        legacy_emails(text)
+        legacy_names(text)
+
+    timings = {}
+    for label, func in (('legacy', legacy), ('engine', extract_all)):
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for text in messages:
+                func(text)
+            best = min(best, time.perf_counter() - start)
+        timings[label] = best
+        print(f"{label:>8}: {best / len(messages) * 1e6:8.1f} us/message")
+    print(f" speedup: {timings['legacy'] / timings['engine']:.1f}x")
+
+if __name__ == '__main__':
+    main()
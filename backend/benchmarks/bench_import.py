@@ -0,0 +1,88 @@
+"""
+Measure the cold-start cost of importing the server (`import app.main`) in
+fresh interpreters, and check it against a budget:
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --runs 9 --budget 0.6
+
+The framework's own import (`import fastapi`) is timed the same way, so
+the app's share is visible. The exit status is 1 when the median import
+time is over the budget, when the app's share of it (beyond `import
+fastapi`) is over APP_SHARE_BUDGET_SECONDS, or when importing the app
+loads any of HEAVY_MODULES that FastAPI itself does not: those must be
+imported lazily by the endpoints that use them (see app/warmup.py).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Median seconds `import app.main` may take before the check fails
+IMPORT_BUDGET_SECONDS = 0.6
+
+# Median seconds `import app.main` may take beyond a bare `import fastapi`;
+# unlike the total, this hardly depends on how fast the machine is
+APP_SHARE_BUDGET_SECONDS = 0.3
+
+# Libraries the app must not import at startup
+HEAVY_MODULES = (
+    'numpy', 'pandas', 'pyarrow', 'openpyxl', 'xlsxwriter', 'spacy',
+    'bs4', 'lxml', 'phonenumbers', 'email_validator',
+)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+def measure(module: str, runs: int) -> Tuple[List[float], List[str]]:
+    """Import times of `module` over `runs` fresh interpreters, and the heavy modules it loaded."""
+    timings, loaded = [], set()
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout
+        result: Dict = json.loads(output.splitlines()[-1])
+        timings.append(result['seconds'])
+        loaded.update(result['loaded'])
+    return timings, sorted(loaded)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_SECONDS,
+                        help='median seconds allowed for import app.main')
+    args = parser.parse_args()
+
+    framework, framework_loaded = measure('fastapi', args.runs)
+    app, app_loaded = measure('app.main', args.runs)
+    framework_median, app_median = statistics.median(framework), statistics.median(app)
+    print(f"import fastapi:  median {framework_median * 1000:6.1f} ms  (min {min(framework) * 1000:6.1f} ms)")
+    print(f"import app.main: median {app_median * 1000:6.1f} ms  (min {min(app) * 1000:6.1f} ms)  "
+          f"app share {(app_median - framework_median) * 1000:6.1f} ms  budget {args.budget * 1000:.0f} ms")
+
+    failed = False
+    if app_median > args.budget:
+        print(f"REGRESSION: import app.main is over budget by {(app_median - args.budget) * 1000:.1f} ms")
+        failed = True
+    if app_median - framework_median > APP_SHARE_BUDGET_SECONDS:
+        print(f"REGRESSION: the app's share of the import is over "
+              f"{APP_SHARE_BUDGET_SECONDS * 1000:.0f} ms")
+        failed = True
+    eager = [name for name in app_loaded if name not in framework_loaded]
+    if eager:
+        print(f"REGRESSION: imported at startup: {', '.join(eager)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
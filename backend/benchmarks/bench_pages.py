@@ -0,0 +1,44 @@
+"""
+Measure how process_html_files scales with worker processes on a
+multi-page export:
+
+    python -m benchmarks.bench_pages --pages 8 --messages-per-page 5000
+"""
+import argparse
+import io
+import os
+import time
+
+from .synthetic_export import write_export
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--messages-per-page', type=int, default=2000)
+    parser.add_argument('--workers', type=int, nargs='+')
+    args = parser.parse_args()
+
+    from app import config
+    from app.controllers import job_controller
+
+    pages = []
+    for seed in range(args.pages):
+        buffer = io.StringIO()
+        write_export(buffer, args.messages_per_page, seed=seed)
+        pages.append(buffer.getvalue().encode('utf-8'))
+
+    total = args.pages * args.messages_per_page
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>9} {'msg/s':>10} {'speedup':>8}")
+    for workers in args.workers or sorted({1, 2, 4, os.cpu_count() or 1}):
+        config.PARSE_WORKERS = workers
+        job_controller.shutdown_pool()
+        start = time.perf_counter()
+        job_controller.process_html_files(pages)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {total / elapsed:>10.0f} {baseline / elapsed:>7.1f}x")
+    job_controller.shutdown_pool()
+
+if __name__ == '__main__':
+    main()
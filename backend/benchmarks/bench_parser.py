@@ -0,0 +1,82 @@
+"""
+Compare the BeautifulSoup parse path with the streaming parser.
+
+Each mode runs in a fresh interpreter so peak RSS is measured in isolation:
+
+    python -m benchmarks.bench_parser --messages 20000 50000
+
+The streaming parser's memory must not grow with the export: the exit
+status is 1 when its peak RSS at the largest size is more than
+MAX_STREAM_GROWTH_MB above its peak at the smallest.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from .synthetic_export import write_export
+
+# Peak RSS the streaming parser may gain between the smallest and largest export
+MAX_STREAM_GROWTH_MB = 16
+
+def run_mode(mode: str, path: str) -> None:
+    from app.services.parser import parse_html, iter_messages
+
+    start = time.perf_counter()
+    if mode == 'soup':
+        with open(path, encoding='utf-8') as f:
+            count = len(parse_html(f.read()))
+    else:
+        with open(path, 'rb') as f:
+            count = sum(1 for _ in iter_messages(f))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{count} {elapsed:.6f} {peak_kb}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--mode', choices=['soup', 'stream'])
+    parser.add_argument('--file')
+    parser.add_argument('--max-growth', type=float, default=MAX_STREAM_GROWTH_MB,
+                        help='MB the streaming peak RSS may grow across sizes')
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.file)
+        return
+
+    print(f"{'messages':>10} {'mode':>7} {'MB':>8} {'seconds':>9} {'msg/s':>10} {'peak RSS MB':>12}")
+    stream_peaks = {}
+    for size in sorted(args.messages):
+        with tempfile.NamedTemporaryFile('w', suffix='.html', encoding='utf-8', delete=False) as f:
+            write_export(f, size)
+            path = f.name
+        try:
+            megabytes = os.path.getsize(path) / 2 ** 20
+            for mode in ('soup', 'stream'):
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.bench_parser', '--mode', mode, '--file', path],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                count, elapsed, peak_kb = int(out[0]), float(out[1]), int(out[2])
+                print(f"{size:>10} {mode:>7} {megabytes:>8.1f} {elapsed:>9.2f} "
+                      f"{count / elapsed:>10.0f} {peak_kb / 1024:>12.1f}")
+                if mode == 'stream':
+                    stream_peaks[size] = peak_kb / 1024
+        finally:
+            os.remove(path)
+
+    smallest, largest = min(stream_peaks), max(stream_peaks)
+    growth = stream_peaks[largest] - stream_peaks[smallest]
+    print(f"stream peak RSS grows {growth:.1f} MB from {smallest} to {largest} messages "
+          f"(allowed {args.max_growth:.0f} MB)")
+    if growth > args.max_growth:
+        print("REGRESSION: streaming parser memory grows with export size")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
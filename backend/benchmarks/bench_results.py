@@ -0,0 +1,72 @@
+"""
+Compare holding a dataset's results as JobPost models with holding them in
+a JobTable: memory, JSON response time and CSV export time.
+
+    python -m benchmarks.bench_results --messages 10000 100000
+"""
+import argparse
+import io
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+
+from .synthetic_export import write_export
+
+def _records(messages: int):
+    from app.controllers.job_controller import iter_html_file
+    out = io.StringIO()
+    write_export(out, messages, service_rate=0.05, repost_rate=0.2, chatter_rate=0.1)
+    return [dict(record) for record in iter_html_file(out.getvalue())]
+
+def run(kind: str, messages: int) -> None:
+    from fastapi.encoders import jsonable_encoder
+    from app.models.job_post import JobPost, JOB_POST_FIELDS
+    from app.models.job_table import JobTable
+    from app.services.exporter import iter_csv
+
+    warnings.simplefilter('ignore', DeprecationWarning)
+    serialized = json.dumps(_records(messages))
+    # Fresh values that only the container keeps, as after a load from the store
+    tracemalloc.start()
+    records = json.loads(serialized)
+    if kind == 'models':
+        results = [JobPost(**record) for record in records]
+    else:
+        results = JobTable.from_records(records)
+    del records
+    held = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    if kind == 'models':
+        body = json.dumps(jsonable_encoder([job.dict() for job in results]), ensure_ascii=False).encode()
+    else:
+        body = results.to_json()
+    json_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows = (job.dict() for job in results) if kind == 'models' else results
+    csv_bytes = sum(len(chunk) for chunk in iter_csv(rows, JOB_POST_FIELDS))
+    csv_seconds = time.perf_counter() - start
+    print(f"{kind:>7} {len(results):>9,} posts  {held:7.1f} MB held  "
+          f"JSON {json_seconds:6.3f} s ({len(body) / 1e6:.1f} MB)  CSV {csv_seconds:6.3f} s ({csv_bytes / 1e6:.1f} MB)")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--run', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run(args.run[0], int(args.run[1]))
+        return
+    # One process per container so memory readings do not overlap
+    for messages in args.messages:
+        for kind in ('models', 'table'):
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_results', '--run', kind, str(messages)],
+                           check=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Build the search index over synthetic job posts and time typical queries
+(keyword, filter, keyword plus filter, date range with facets, next page):
+
+    python -m benchmarks.bench_search --messages 100000 1000000
+"""
+import argparse
+import io
+import statistics
+import time
+
+from .synthetic_export import write_export
+
+QUERIES = {
+    'keyword': {'query': 'software umbrella'},
+    'filter': {'filters': {'email_domain': 'initech.com'}},
+    'keyword+filter': {'query': 'intern', 'filters': {'email_domain': 'acme.com'}},
+    'dates+facets': {'date_from': '2024-03-01', 'date_to': '2024-06-30',
+                     'facets': ('company', 'location', 'email_domain')},
+    'all+facets': {'facets': ('company', 'location', 'job_title', 'email_domain', 'date_of_posting')},
+}
+
+REPEATS = 20
+
+def bench(messages: int) -> None:
+    from app.controllers.job_controller import process_html_file
+    from app.services.search_index import SearchIndex
+
+    out = io.StringIO()
+    write_export(out, messages, service_rate=0.05, repost_rate=0.2, chatter_rate=0.1)
+    table = process_html_file(out.getvalue(), filter_noise=True)
+    del out
+
+    start = time.perf_counter()
+    index = SearchIndex(table)
+    print(f"{len(table):>9,} posts  index built in {time.perf_counter() - start:6.2f} s  "
+          f"({len(index.terms):,} terms)")
+
+    for name, params in QUERIES.items():
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            first = index.search(**params)
+            if first['next_cursor']:
+                index.search(**params, cursor=int(first['next_cursor']))
+            timings.append(time.perf_counter() - start)
+        print(f"  {name:>15}: {first['total']:>9,} matches  "
+              f"median {statistics.median(timings) * 1000:7.2f} ms for two pages")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, nargs='+', default=[100000, 1000000])
+    args = parser.parse_args()
+    for messages in args.messages:
+        bench(messages)
+
+if __name__ == '__main__':
+    main()
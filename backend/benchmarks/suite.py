@@ -0,0 +1,198 @@
+"""
+Benchmark every pipeline stage on synthetic Telegram exports and report
+throughput and peak memory:
+
+    python -m benchmarks.suite --sizes 1000 100000 1000000
+    python -m benchmarks.suite --save baseline.json
+    python -m benchmarks.suite --compare baseline.json --tolerance 0.15
+
+Each stage runs in a fresh interpreter so its peak RSS is isolated. Its
+inputs (message texts, extracted fields, job posts) are prepared before
+the clock starts, and "stage MB" is how far RSS rose above that point.
+With --compare, a stage whose throughput fell, or whose memory grew, by
+more than the tolerance is flagged and the exit status is 1. A stage that
+fails (for example, killed when out of memory) is reported and the suite
+goes on.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .synthetic_export import write_export
+
+STAGES = (
+    'parse_html', 'extract_job_info', 'clean_job_post', 'process_html_file',
+    'export_to_csv', 'excel_file', 'excel_contacts',
+)
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+# Largest export a stage runs on unless --sizes is given: the BeautifulSoup
+# parse holds the whole document tree, about 430 MB per 20k messages
+DEFAULT_MAX_SIZE = {'parse_html': 100000}
+
+# Share of each kind of message block in the generated exports
+SERVICE_RATE = 0.05
+REPOST_RATE = 0.2
+CHATTER_RATE = 0.1
+
+# Memory growth below this many MB is never flagged; small stages are noisy
+RSS_SLACK_MB = 5.0
+
+def _current_rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _texts(path: str) -> List[str]:
+    from app.services.parser import iter_messages
+    with open(path, 'rb') as f:
+        return list(iter_messages(f))
+
+def _job_dicts(path: str) -> List[Dict[str, Any]]:
+    from app.controllers.job_controller import process_html_file
+    with open(path, 'rb') as f:
+        return list(process_html_file(f).dicts())
+
+def _prepare(stage: str, path: str) -> Callable[[], Any]:
+    """Load a stage's inputs and return the work to time."""
+    if stage == 'parse_html':
+        from app.services.parser import parse_html
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        return lambda: parse_html(html)
+    if stage in ('extract_job_info', 'clean_job_post'):
+        from app.services.extractor import extract_job_info
+        texts = _texts(path)
+        if stage == 'extract_job_info':
+            return lambda: [extract_job_info(text) for text in texts]
+        from app.services.cleaner import clean_job_post
+        raw = [extract_job_info(text) for text in texts]
+        return lambda: [clean_job_post(data) for data in raw]
+    if stage == 'process_html_file':
+        from app.controllers.job_controller import process_html_file
+        def work():
+            with open(path, 'rb') as f:
+                return process_html_file(f)
+        return work
+    if stage == 'export_to_csv':
+        from app.services.exporter import export_to_csv
+        jobs = _job_dicts(path)
+        return lambda: export_to_csv(jobs)
+
+    from app.services.excel_exporter import ExcelExporter
+    exporter = ExcelExporter()
+    build = exporter.create_excel_file if stage == 'excel_file' else exporter.create_contacts_only_excel
+    jobs = _job_dicts(path)
+    def work():
+        fd, out = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            build(jobs, out)
+        finally:
+            os.remove(out)
+    return work
+
+def run_stage(stage: str, path: str) -> None:
+    """Child process: time one stage and print its result as JSON."""
+    work = _prepare(stage, path)
+    before = _current_rss_mb()
+    start = time.perf_counter()
+    work()
+    seconds = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'seconds': seconds, 'peak_rss_mb': peak, 'stage_rss_mb': max(peak - before, 0.0)}))
+
+def _measure(stage: str, path: str, size: int) -> Optional[Dict[str, Any]]:
+    """Run one stage in a fresh interpreter; None if it failed, with the reason printed."""
+    try:
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.suite', '--run', stage, path],
+            check=True, capture_output=True, text=True,
+        ).stdout
+    except subprocess.CalledProcessError as e:
+        reason = f"killed by signal {-e.returncode}" if e.returncode < 0 else f"exit status {e.returncode}"
+        print(f"{stage:>18} {size:>9}  FAILED: {reason}", flush=True)
+        return None
+    result = json.loads(out.splitlines()[-1])
+    result.update(stage=stage, size=size, throughput=size / result['seconds'])
+    return result
+
+def _regressions(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    flags = []
+    if result['throughput'] < baseline['throughput'] * (1 - tolerance):
+        flags.append(f"throughput -{1 - result['throughput'] / baseline['throughput']:.0%}")
+    allowed = max(baseline['stage_rss_mb'] * (1 + tolerance), baseline['stage_rss_mb'] + RSS_SLACK_MB)
+    if result['stage_rss_mb'] > allowed:
+        flags.append(f"memory +{result['stage_rss_mb'] - baseline['stage_rss_mb']:.0f} MB")
+    return flags
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        help=f"messages per export (default: {' '.join(map(str, DEFAULT_SIZES))}, "
+                             f"with parse_html up to {DEFAULT_MAX_SIZE['parse_html']})")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file written by --save')
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    parser.add_argument('--run', nargs=2, metavar=('STAGE', 'EXPORT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_stage(*args.run)
+        return
+
+    baseline: Dict[Tuple[str, int], Dict[str, Any]] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(r['stage'], r['size']): r for r in json.load(f)['results']}
+
+    results, regressed = [], False
+    print(f"{'stage':>18} {'messages':>9} {'seconds':>9} {'msg/s':>10} {'peak RSS MB':>12} {'stage MB':>9}"
+          + ('  vs baseline' if baseline else ''))
+    for size in args.sizes or DEFAULT_SIZES:
+        stages = [stage for stage in args.stages
+                  if args.sizes or size <= DEFAULT_MAX_SIZE.get(stage, size)]
+        with tempfile.NamedTemporaryFile('w', suffix='.html', encoding='utf-8', delete=False) as f:
+            write_export(f, size, service_rate=SERVICE_RATE, repost_rate=REPOST_RATE, chatter_rate=CHATTER_RATE)
+            path = f.name
+        try:
+            for stage in stages:
+                result = _measure(stage, path, size)
+                if result is None:
+                    regressed = regressed or (stage, size) in baseline
+                    continue
+                results.append(result)
+                line = (f"{stage:>18} {size:>9} {result['seconds']:>9.2f} {result['throughput']:>10.0f} "
+                        f"{result['peak_rss_mb']:>12.1f} {result['stage_rss_mb']:>9.1f}")
+                previous = baseline.get((stage, size))
+                if previous:
+                    flags = _regressions(result, previous, args.tolerance)
+                    regressed = regressed or bool(flags)
+                    if flags:
+                        line += '  REGRESSION: ' + ', '.join(flags)
+                    else:
+                        line += f"  ok ({result['throughput'] / previous['throughput']:.2f}x)"
+                print(line, flush=True)
+        finally:
+            os.remove(path)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, f, indent=2)
+    if regressed:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Generate synthetic Telegram Desktop HTML exports for benchmarking.
+
+Exports mix job posts (with emails, phones and links), forwarded reposts
+of earlier posts, chat replies and service messages such as date
+separators. Write one to disk with:
+
+    python -m benchmarks.synthetic_export --messages 100000 --out export.html
+"""
+import argparse
+import random
+from typing import List, TextIO
+
+HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8"/>
+<title>Exported Data</title>
+</head>
+<body>
+<div class="page_wrap">
+<div class="page_header"><div class="content"><div class="text bold">Synthetic Jobs</div></div></div>
+<div class="page_body chat_page">
+<div class="history">
+"""
+
+FOOTER = """</div>
+</div>
+</div>
+</body>
+</html>
+"""
+
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries']
+TITLES = ['Software Engineer', 'Data Analyst', 'Backend Developer', 'QA Intern', 'DevOps Engineer']
+LOCATIONS = ['Bangalore', 'Pune', 'Remote', 'Hyderabad', 'Mumbai']
+RECRUITERS = ['Priya Sharma', 'Rahul Verma', 'Anita Desai', 'Vikram Rao']
+CHATTER = ['Thanks!', 'Is this still open?', 'Please share the JD', 'Applied 👍', 'Any openings for freshers?']
+SERVICE_TEXTS = ['{day} January 2024', '{name} joined group by link', '{name} pinned this message']
+REPOST_PREFIXES = ['🔥 Still hiring! ', 'Reposting: ', 'URGENT ', '']
+
+def job_text(rng: random.Random, index: int) -> str:
+    company = rng.choice(COMPANIES)
+    return (
+        f"Job Title: {rng.choice(TITLES)}<br>"
+        f"Company: {company}<br>"
+        f"Location: {rng.choice(LOCATIONS)}<br>"
+        f"Apply at hr{index % 500}@{company.split()[0].lower()}.com or call +91 98{index % 100000000:08d}<br>"
+        f"Posted 2024-{index % 12 + 1:02d}-{index % 28 + 1:02d} https://jobs.example.com/{index}"
+    )
+
+def message_html(rng: random.Random, index: int, text: str = None, forwarded_from: str = None) -> str:
+    """A regular message; a job post unless `text` is given, wrapped as a forward with `forwarded_from`."""
+    text = text if text is not None else job_text(rng, index)
+    if forwarded_from:
+        text = (f'<div class="forwarded body">\n<div class="from_name">{forwarded_from}</div>\n'
+                f'<div class="text">{text}</div>\n</div>')
+    else:
+        text = f'<div class="text">{text}</div>'
+    return (
+        f'<div class="message default clearfix" id="message{index}">\n'
+        f'<div class="pull_left userpic_wrap"><div class="userpic userpic1" style="width: 42px; height: 42px">'
+        f'<div class="initials" style="line-height: 42px">HR</div></div></div>\n'
+        f'<div class="body">\n'
+        f'<div class="pull_right date details" title="12.01.2024 10:{index % 60:02d}:00 UTC+05:30">10:{index % 60:02d}</div>\n'
+        f'<div class="from_name">Recruiter</div>\n'
+        f'{text}\n'
+        f'</div>\n'
+        f'</div>\n'
+    )
+
+def service_html(rng: random.Random, index: int) -> str:
+    """A service message (date separator, join or pin notice); Telegram numbers these negatively."""
+    text = rng.choice(SERVICE_TEXTS).format(day=index % 28 + 1, name=rng.choice(RECRUITERS))
+    return (
+        f'<div class="message service" id="message-{index}">\n'
+        f'<div class="body details">\n{text}\n</div>\n'
+        f'</div>\n'
+    )
+
+def write_export(out: TextIO, messages: int, seed: int = 0, service_rate: float = 0.0,
+                 repost_rate: float = 0.0, chatter_rate: float = 0.0) -> None:
+    """
+    Write an export containing `messages` message blocks to `out`. By
+    default every block is a distinct job post; the rates set the share of
+    service messages, forwarded reposts of earlier job posts, and chat
+    replies that are not job posts.
+    """
+    rng = random.Random(seed)
+    posts: List[str] = []
+    mixed = service_rate or repost_rate or chatter_rate
+    out.write(HEADER)
+    for index in range(1, messages + 1):
+        roll = rng.random() if mixed else 1.0
+        if roll < service_rate:
+            out.write(service_html(rng, index))
+        elif roll < service_rate + chatter_rate:
+            out.write(message_html(rng, index, rng.choice(CHATTER)))
+        elif posts and roll < service_rate + chatter_rate + repost_rate:
+            text = rng.choice(REPOST_PREFIXES) + rng.choice(posts)
+            out.write(message_html(rng, index, text, forwarded_from=rng.choice(RECRUITERS)))
+        else:
+            text = job_text(rng, index)
+            if repost_rate and len(posts) < 10000:
+                posts.append(text)
+            out.write(message_html(rng, index, text))
+    out.write(FOOTER)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=10000)
+    parser.add_argument('--out', required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--service-rate', type=float, default=0.05)
+    parser.add_argument('--repost-rate', type=float, default=0.2)
+    parser.add_argument('--chatter-rate', type=float, default=0.1)
+    args = parser.parse_args()
+    with open(args.out, 'w', encoding='utf-8') as f:
+        write_export(f, args.messages, args.seed, args.service_rate, args.repost_rate, args.chatter_rate)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+"""
+The server must start quickly: importing app.main adds little to the
+framework's own import and leaves the heavy libraries to the endpoints
+that use them (see app/warmup.py). Each import is measured in a fresh
+interpreter. The app's share is checked rather than the total, which
+mostly depends on the machine.
+"""
+import statistics
+
+from benchmarks.bench_import import APP_SHARE_BUDGET_SECONDS, HEAVY_MODULES, measure
+
+RUNS = 3
+
+def test_app_share_of_import_is_within_budget():
+    framework, _ = measure('fastapi', RUNS)
+    app, _ = measure('app.main', RUNS)
+    assert statistics.median(app) - statistics.median(framework) <= APP_SHARE_BUDGET_SECONDS
+
+def test_import_loads_no_heavy_module():
+    _, framework_loaded = measure('fastapi', 1)
+    _, app_loaded = measure('app.main', 1)
+    assert [name for name in HEAVY_MODULES if name in app_loaded and name not in framework_loaded] == []
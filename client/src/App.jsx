@@ -12,6 +12,7 @@ function App() {
   const [filteredJobs, setFilteredJobs] = useState([]);
   const [showFiltered, setShowFiltered] = useState(true);
   const [isUploading, setIsUploading] = useState(false);
+  const [serverFiltered, setServerFiltered] = useState(0);
 
   // Update filtered jobs when original jobs change
   useEffect(() => {
@@ -21,10 +22,14 @@ function App() {
     }
   }, [originalJobs]);
 
-  const handleFileUpload = async (file) => {
+  const handleFileUpload = async (files) => {
     setIsUploading(true);
     try {
-      const parsedJobs = await apiService.uploadFile(file);
+      // Show rows as they are extracted, then the complete result
+      setOriginalJobs([]);
+      const parsedJobs = await apiService.uploadFileStreaming(
+        files, (batch) => setOriginalJobs((jobs) => jobs.concat(batch)));
+      setServerFiltered(apiService.messagesFiltered);
       setOriginalJobs(parsedJobs);
     } catch (error) {
       console.error('Error processing file:', error);
@@ -53,7 +58,7 @@ function App() {
   const currentJobs = showFiltered ? filteredJobs : originalJobs;
   
   // Get statistics
-  const statistics = getJobStatistics(originalJobs, filteredJobs);
+  const statistics = getJobStatistics(originalJobs, filteredJobs, serverFiltered);
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-blue-50 via-purple-50 to-pink-50">
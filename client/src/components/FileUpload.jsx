@@ -20,22 +20,24 @@ const FileUpload = ({ onFileUpload, isUploading }) => {
     
     const files = e.dataTransfer.files;
     if (files.length > 0) {
-      handleFileSelection(files[0]);
+      handleFileSelection(files);
     }
   };
 
-  const handleFileSelection = (file) => {
-    if (file && file.type === 'text/html') {
-      onFileUpload(file);
+  const isExportFile = (file) => /\.(html|zip)$/i.test(file.name);
+
+  const handleFileSelection = (fileList) => {
+    const files = Array.from(fileList);
+    if (files.length > 0 && files.every(isExportFile)) {
+      onFileUpload(files);
     } else {
-      alert('Please upload a valid HTML file');
+      alert('Please upload HTML export pages or a ZIP archive');
     }
   };
 
   const handleFileInputChange = (e) => {
-    const file = e.target.files[0];
-    if (file) {
-      handleFileSelection(file);
+    if (e.target.files.length > 0) {
+      handleFileSelection(e.target.files);
     }
   };
 
@@ -59,7 +61,8 @@ const FileUpload = ({ onFileUpload, isUploading }) => {
         <input
           ref={fileInputRef}
           type="file"
-          accept=".html"
+          accept=".html,.zip"
+          multiple
           onChange={handleFileInputChange}
           className="hidden"
           disabled={isUploading}
@@ -87,10 +90,10 @@ const FileUpload = ({ onFileUpload, isUploading }) => {
               {isUploading ? 'Processing...' : 'Upload Telegram HTML Export'}
             </h3>
             <p className="text-gray-600 mb-4">
-              Drag and drop your HTML file here, or click to browse
+              Drag and drop your HTML pages or ZIP export here, or click to browse
             </p>
             <p className="text-sm text-gray-500">
-              Supports: .html files only
+              Supports: .html pages (messages.html, messages2.html, ...) and .zip archives
             </p>
           </div>
           
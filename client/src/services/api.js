@@ -4,16 +4,35 @@ const API_BASE_URL = 'http://localhost:8000';
 class ApiService {
   constructor() {
     this.baseURL = API_BASE_URL;
+    // Dataset produced by the most recent upload; downloads read from it
+    this.datasetId = null;
+    // Noise messages the backend dropped from that upload
+    this.messagesFiltered = 0;
+  }
+
+  /**
+   * Build a URL for an endpoint that reads the current dataset
+   * @param {string} path - API path
+   * @returns {string} - URL including the dataset ID
+   */
+  datasetURL(path) {
+    if (!this.datasetId) {
+      throw new Error('Upload a file before downloading or analyzing data.');
+    }
+    return `${this.baseURL}${path}?dataset_id=${encodeURIComponent(this.datasetId)}`;
   }
 
     /**
-   * Upload HTML file and get parsed job data
-   * @param {File} file - The HTML file to upload
+   * Upload export pages or a ZIP archive and get parsed job data
+   * @param {File|File[]} files - The HTML pages or ZIP archive to upload
+   * @param {Function} onProgress - Optional callback receiving task progress
    * @returns {Promise<Array>} - Array of parsed job postings
    */
-  async uploadFile(file) {
+  async uploadFile(files, onProgress) {
     const formData = new FormData();
-    formData.append('file', file);
+    for (const file of [].concat(files)) {
+      formData.append('file', file);
+    }
 
     try {
       const response = await fetch(`${this.baseURL}/api/upload`, {
@@ -25,21 +44,133 @@ class ApiService {
         throw new Error(`HTTP error! status: ${response.status}`);
       }
 
-      const data = await response.json();
-      return data;
+      const task = await response.json();
+      const finished = await this.waitForTask(task.task_id, onProgress);
+      const results = await this.getTaskResults(task.task_id);
+      this.datasetId = task.dataset_id;
+      this.messagesFiltered = finished.progress.messages_filtered || 0;
+      return results;
+    } catch (error) {
+      console.error('Error uploading file:', error);
+      throw new Error('Failed to upload and process file. Please check your backend connection.');
+    }
+  }
+
+  /**
+   * Upload export files and receive job postings as they are extracted.
+   * The backend streams NDJSON records; onRecords is called with the
+   * records received since its previous call, at most every `interval` ms.
+   * @param {File|File[]} files - HTML export pages or ZIP archives
+   * @param {Function} onRecords - Called with each newly received batch of records
+   * @returns {Promise<Array>} - All parsed job postings
+   */
+  async uploadFileStreaming(files, onRecords, interval = 200) {
+    const formData = new FormData();
+    for (const file of [].concat(files)) {
+      formData.append('file', file);
+    }
+    formData.append('stream', 'true');
+
+    try {
+      const response = await fetch(`${this.baseURL}/api/upload`, {
+        method: 'POST',
+        body: formData,
+      });
+
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+
+      const datasetId = response.headers.get('X-Dataset-Id');
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      const records = [];
+      let buffer = '';
+      let reported = 0;
+      let sent = 0;
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        for (const line of lines) {
+          if (line) records.push(JSON.parse(line));
+        }
+        if (Date.now() - reported >= interval && records.length > sent) {
+          onRecords?.(records.slice(sent));
+          sent = records.length;
+          reported = Date.now();
+        }
+      }
+      if (buffer) records.push(JSON.parse(buffer));
+
+      const task = await this.getTaskStatus(datasetId);
+      if (task.status === 'failed') {
+        throw new Error(task.error || 'Processing failed');
+      }
+      this.datasetId = datasetId;
+      this.messagesFiltered = task.progress.messages_filtered || 0;
+      return records;
     } catch (error) {
       console.error('Error uploading file:', error);
       throw new Error('Failed to upload and process file. Please check your backend connection.');
     }
   }
 
+  /**
+   * Get the status and progress of a background upload
+   * @param {string} taskId - Task ID returned by the upload
+   * @returns {Promise<Object>} - Task status
+   */
+  async getTaskStatus(taskId) {
+    const response = await fetch(`${this.baseURL}/api/tasks/${taskId}`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+  }
+
+  /**
+   * Poll a background upload until it completes
+   * @param {string} taskId - Task ID returned by the upload
+   * @param {Function} onProgress - Optional callback receiving task progress
+   * @param {number} interval - Polling interval in milliseconds
+   * @returns {Promise<Object>} - Final task status
+   */
+  async waitForTask(taskId, onProgress, interval = 500) {
+    for (;;) {
+      const task = await this.getTaskStatus(taskId);
+      onProgress?.(task.progress);
+      if (task.status === 'completed') {
+        return task;
+      }
+      if (task.status === 'failed') {
+        throw new Error(task.error || 'Processing failed');
+      }
+      await new Promise((resolve) => setTimeout(resolve, interval));
+    }
+  }
+
+  /**
+   * Fetch the extracted job postings of a finished upload
+   * @param {string} taskId - Task ID returned by the upload
+   * @returns {Promise<Array>} - Array of parsed job postings
+   */
+  async getTaskResults(taskId) {
+    const response = await fetch(`${this.baseURL}/api/tasks/${taskId}/results`);
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+  }
+
   /**
    * Download CSV file of parsed job data
    * @returns {Promise<Blob>} - CSV file as blob
    */
   async downloadCSV() {
     try {
-      const response = await fetch(`${this.baseURL}/api/download`, {
+      const response = await fetch(this.datasetURL('/api/download'), {
         method: 'GET',
         headers: {
           'Accept': 'text/csv',
@@ -89,7 +220,7 @@ class ApiService {
    */
   async downloadExcel() {
     try {
-      const response = await fetch(`${this.baseURL}/api/download/excel`, {
+      const response = await fetch(this.datasetURL('/api/download/excel'), {
         method: 'GET',
         headers: {
           'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -139,7 +270,7 @@ class ApiService {
    */
   async downloadContacts() {
     try {
-      const response = await fetch(`${this.baseURL}/api/download/contacts`, {
+      const response = await fetch(this.datasetURL('/api/download/contacts'), {
         method: 'GET',
         headers: {
           'Accept': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
@@ -189,7 +320,7 @@ class ApiService {
    */
   async analyzeContacts() {
     try {
-      const response = await fetch(`${this.baseURL}/api/analyze/contacts`, {
+      const response = await fetch(this.datasetURL('/api/analyze/contacts'), {
         method: 'GET',
         headers: {
           'Accept': 'application/json',
@@ -208,6 +339,33 @@ class ApiService {
     }
   }
 
+  /**
+   * Search the current dataset on the server, one page at a time
+   * @param {Object} params - q, company, location, job_title, email_domain,
+   *   date_from, date_to, facets (array), facet_limit, limit and cursor
+   * @returns {Promise<Object>} - { total, items, next_cursor, facets }
+   */
+  async searchJobs(params = {}) {
+    const query = new URLSearchParams();
+    for (const [key, value] of Object.entries(params)) {
+      for (const item of [].concat(value)) {
+        if (item !== undefined && item !== null && item !== '') {
+          query.append(key, item);
+        }
+      }
+    }
+
+    const response = await fetch(`${this.datasetURL('/api/search')}&${query}`, {
+      headers: {
+        'Accept': 'application/json',
+      },
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+  }
+
   /**
    * Check if backend is available
    * @returns {Promise<boolean>} - True if backend is available
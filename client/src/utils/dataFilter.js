@@ -158,10 +158,11 @@ export const cleanJobDescription = (description) => {
  * Gets statistics about the filtered data
  * @param {Array} originalJobs - Original job array
  * @param {Array} filteredJobs - Filtered job array
+ * @param {number} serverFiltered - Noise messages the backend already dropped
  * @returns {Object} - Statistics object
  */
-export const getJobStatistics = (originalJobs, filteredJobs) => {
-  const totalRows = originalJobs?.length || 0;
+export const getJobStatistics = (originalJobs, filteredJobs, serverFiltered = 0) => {
+  const totalRows = (originalJobs?.length || 0) + serverFiltered;
   const jobRows = filteredJobs?.length || 0;
   const filteredOut = totalRows - jobRows;
   const filterPercentage = totalRows > 0 ? ((filteredOut / totalRows) * 100).toFixed(1) : 0;